@@ -3,15 +3,19 @@ Shared pytest fixtures for e2e tests.
 Provides: dev server, Playwright browser, parametrized test files.
 """
 
+import hashlib
 import json
 import os
+import shutil
 import signal
 import subprocess
+import threading
 import time
 from pathlib import Path
 
 import pytest
 import requests
+from playwright.sync_api import Error as PlaywrightError
 from playwright.sync_api import sync_playwright
 
 import testdata_paths as tdp
@@ -71,21 +75,24 @@ def pytest_addoption(parser):
     )
 
 
+def pytest_configure(config):
+    if config.getoption("--update-baselines"):
+        import extract_ground_truth
+
+        extract_ground_truth.GT_CACHE_REFRESH = True
+
+
 # ---------------------------------------------------------------------------
 # Dev Server Fixture
 # ---------------------------------------------------------------------------
 
-@pytest.fixture(scope="session")
-def dev_server_url(request):
-    """Start Vite dev server if not already running, return its URL."""
-    url = request.config.getoption("--dev-server-url")
-
+def _start_dev_server(url: str) -> subprocess.Popen | None:
+    """Start Vite unless a server already answers at url; block until ready."""
     # Check if server is already running
     try:
         resp = requests.get(url, timeout=3)
         if resp.status_code == 200:
-            yield url
-            return
+            return None
     except requests.ConnectionError:
         pass
 
@@ -111,13 +118,54 @@ def dev_server_url(request):
         proc.terminate()
         raise RuntimeError(f"Dev server failed to start within {SERVER_STARTUP_TIMEOUT}s")
 
-    yield url
+    return proc
+
+
+class _DevServerBoot(threading.Thread):
+    """Runs _start_dev_server in the background so it overlaps Chromium launch.
+
+    Playwright's sync API is bound to the thread that created it, so the
+    browser stays on the main thread and the Vite wait moves off it instead.
+    """
+
+    def __init__(self, url: str):
+        super().__init__(name="vite-dev-server", daemon=True)
+        self.url = url
+        self.proc: subprocess.Popen | None = None
+        self.error: BaseException | None = None
+
+    def run(self):
+        try:
+            self.proc = _start_dev_server(self.url)
+        except BaseException as e:
+            self.error = e
+
+    def wait(self) -> str:
+        self.join()
+        if self.error is not None:
+            raise self.error
+        return self.url
+
+
+@pytest.fixture(scope="session")
+def _dev_server_boot(request):
+    boot = _DevServerBoot(request.config.getoption("--dev-server-url"))
+    boot.start()
+    yield boot
 
     # Teardown: kill the process group
-    try:
-        os.killpg(os.getpgid(proc.pid), signal.SIGTERM)
-    except ProcessLookupError:
-        pass
+    boot.join()
+    if boot.proc is not None:
+        try:
+            os.killpg(os.getpgid(boot.proc.pid), signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+
+@pytest.fixture(scope="session")
+def dev_server_url(_dev_server_boot):
+    """Start Vite dev server if not already running, return its URL."""
+    return _dev_server_boot.wait()
 
 
 # ---------------------------------------------------------------------------
@@ -125,73 +173,160 @@ def dev_server_url(request):
 # ---------------------------------------------------------------------------
 
 @pytest.fixture(scope="session")
-def browser():
-    """Launch a Playwright Chromium browser for the test session."""
+def browser(_dev_server_boot):
+    """Launch a Playwright Chromium browser for the test session.
+
+    Requesting _dev_server_boot first lets Vite come up while Chromium launches.
+    """
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
         yield browser
         browser.close()
 
 
+@pytest.fixture(scope="session")
+def shared_context(browser):
+    """One browser context for the session; tests only open and close pages."""
+    ctx = browser.new_context(viewport={"width": 1920, "height": 1080})
+    yield ctx
+    ctx.close()
+
+
 @pytest.fixture(scope="function")
-def page(browser, dev_server_url):
+def page(shared_context, dev_server_url):
     """Create a new browser page for each test."""
-    ctx = browser.new_context(viewport={"width": 1920, "height": 1080})
-    pg = ctx.new_page()
+    pg = shared_context.new_page()
     pg.set_default_timeout(PAGE_TIMEOUT_MS)
     yield pg
     pg.close()
-    ctx.close()
+
+
+# ---------------------------------------------------------------------------
+# Per-run Cache (shared by pytest-xdist workers)
+# ---------------------------------------------------------------------------
+
+RUN_CACHE_NAME = "e2e-run-cache"
+
+
+def _run_id(config) -> str | None:
+    """xdist's testrunuid: exported to workers, held by the controller's node manager."""
+    run_id = os.getenv("PYTEST_XDIST_TESTRUNUID")
+    if run_id is None:
+        dsession = config.pluginmanager.getplugin("dsession")
+        run_id = getattr(getattr(dsession, "nodemanager", None), "testrunuid", None)
+    return run_id
+
+
+def _run_cache_dir(config) -> Path | None:
+    """Directory shared by the xdist workers of this run; None outside xdist."""
+    run_id = _run_id(config)
+    if not run_id or getattr(config, "cache", None) is None:
+        return None
+    path = config.cache.mkdir(RUN_CACHE_NAME) / run_id
+    path.mkdir(exist_ok=True)
+    return path
+
+
+def _write_json_atomic(path: Path, data) -> None:
+    # Write-then-rename so a concurrent worker never reads a partial file
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def pytest_sessionfinish(session):
+    # Only the xdist controller drops this run's entries; concurrent sessions
+    # in the same checkout keep their own run directories.
+    if os.getenv("PYTEST_XDIST_WORKER") is None:
+        run_dir = _run_cache_dir(session.config)
+        if run_dir is not None:
+            shutil.rmtree(run_dir, ignore_errors=True)
 
 
 # ---------------------------------------------------------------------------
 # Model Export Fixture
 # ---------------------------------------------------------------------------
 
+class _ExportCache:
+    """In-memory export cache, mirrored to disk when running under pytest-xdist.
+
+    Disk entries live in a per-run directory of the pytest cache and are keyed
+    by (test_file, source.pptx mtime + size), so workers of the same run share
+    exports while a new run never sees output from an older renderer build.
+    """
+
+    def __init__(self, disk_dir: Path | None = None):
+        self._mem: dict[str, dict] = {}
+        self._disk_dir = disk_dir
+
+    def _disk_path(self, test_file: str) -> Path:
+        st = tdp.source_pptx(test_file).stat()
+        key = f"{test_file}\0{st.st_mtime_ns}\0{st.st_size}"
+        return self._disk_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    def get(self, test_file: str) -> dict | None:
+        if test_file in self._mem:
+            return self._mem[test_file]
+        if self._disk_dir is None:
+            return None
+        try:
+            data = json.loads(self._disk_path(test_file).read_bytes())
+        except (OSError, ValueError):
+            return None
+        self._mem[test_file] = data
+        return data
+
+    def put(self, test_file: str, data: dict) -> None:
+        self._mem[test_file] = data
+        if self._disk_dir is None:
+            return
+        _write_json_atomic(self._disk_path(test_file), data)
+
+
 @pytest.fixture(scope="session")
-def _export_cache():
+def _export_cache(request):
     """Session-level cache for exported presentation JSON."""
-    return {}
+    run_dir = _run_cache_dir(request.config)
+    if run_dir is None:
+        return _ExportCache()
+    disk_dir = run_dir / "exports"
+    disk_dir.mkdir(exist_ok=True)
+    return _ExportCache(disk_dir)
+
+
+@pytest.fixture(scope="session")
+def exporter_page(shared_context, dev_server_url):
+    """Long-lived export.html page; exports run through window.__runExport."""
+    pg = shared_context.new_page()
+    pg.set_default_timeout(PAGE_TIMEOUT_MS)
+    pg.goto(f"{dev_server_url}/test/pages/export.html")
+    pg.wait_for_function("() => window.__ready === true", timeout=PAGE_TIMEOUT_MS)
+    yield pg
+    pg.close()
 
 
 @pytest.fixture(scope="function")
-def export_presentation(browser, dev_server_url, _export_cache):
+def export_presentation(exporter_page, _export_cache):
     """
     Returns a callable that exports a PPTX file's serialized model via Playwright.
     Results are cached per test file for the session.
     """
     def _export(test_file: str) -> dict:
-        if test_file in _export_cache:
-            return _export_cache[test_file]
+        cached = _export_cache.get(test_file)
+        if cached is not None:
+            return cached
 
         stem, source = tdp.split_case_ref(test_file)
         subdir = tdp.testdata_subdir(source)
+        file = f"testdata/{subdir}/{stem}/source.pptx"
 
-        ctx = browser.new_context()
-        pg = ctx.new_page()
-        pg.set_default_timeout(PAGE_TIMEOUT_MS)
-
-        url = f"{dev_server_url}/test/pages/export.html?file=testdata/{subdir}/{stem}/source.pptx"
-        pg.goto(url)
-
-        # Wait for export to complete
-        pg.wait_for_function(
-            "() => window.__exportResult !== undefined || window.__exportError !== undefined",
-            timeout=PAGE_TIMEOUT_MS,
-        )
-
-        error = pg.evaluate("() => window.__exportError")
-        if error:
-            pg.close()
-            ctx.close()
-            raise RuntimeError(f"Export failed for {test_file}: {error}")
-
-        result = pg.evaluate("() => JSON.stringify(window.__exportResult)")
-        pg.close()
-        ctx.close()
-
-        data = json.loads(result)
-        _export_cache[test_file] = data
+        # Playwright serializes the returned object itself; stringifying in V8
+        # and re-parsing here would walk the whole model twice.
+        try:
+            data = exporter_page.evaluate("file => window.__runExport(file)", file)
+        except PlaywrightError as e:
+            raise RuntimeError(f"Export failed for {test_file}: {e.message}") from e
+        _export_cache.put(test_file, data)
         return data
 
     return _export
@@ -201,19 +336,72 @@ def export_presentation(browser, dev_server_url, _export_cache):
 # Parametrization Helpers
 # ---------------------------------------------------------------------------
 
-def pytest_generate_tests(metafunc):
-    """Parametrize tests that request 'test_file' fixture."""
-    if "test_file" in metafunc.fixturenames:
-        source = metafunc.config.getoption("--testdata-source")
-        cases = []
+_available_test_files_memo: dict[str, list[list]] = {}
+
+
+def _available_test_files(config, source: str) -> list[list]:
+    """[case_ref, source.pptx size] pairs for --testdata-source, listed once per process.
+
+    Under xdist the first worker to collect shares its listing with the
+    others through the per-run cache instead of each re-walking testdata/.
+    """
+    if source in _available_test_files_memo:
+        return _available_test_files_memo[source]
+
+    run_dir = _run_cache_dir(config)
+    shared_path = run_dir / f"available-cases-{source}.json" if run_dir else None
+    cases = None
+    if shared_path is not None:
+        try:
+            cases = json.loads(shared_path.read_bytes())
+        except (OSError, ValueError):
+            pass
+
+    if cases is None:
+        refs = []
         if source in ("cases", "all"):
-            cases.extend(tdp.list_cases_with_ground_truth())
+            refs.extend(tdp.list_cases_with_ground_truth())
         if source in ("windows", "all"):
-            cases.extend(
+            refs.extend(
                 tdp.encode_case_ref(stem, "windows")
                 for stem in tdp.list_cases_with_ground_truth("windows")
             )
-        metafunc.parametrize("test_file", cases)
+        cases = [[ref, tdp.source_pptx(ref).stat().st_size] for ref in refs]
+        if shared_path is not None:
+            _write_json_atomic(shared_path, cases)
+
+    _available_test_files_memo[source] = cases
+    return cases
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize tests that request 'test_file' fixture.
+
+    Each case carries a filesize mark (source.pptx bytes) so collection can be
+    reordered largest-first; see pytest_collection_modifyitems.
+    """
+    if "test_file" in metafunc.fixturenames:
+        source = metafunc.config.getoption("--testdata-source")
+        sized = _available_test_files(metafunc.config, source)
+        metafunc.parametrize(
+            "test_file",
+            [pytest.param(ref, marks=pytest.mark.filesize(size)) for ref, size in sized],
+            ids=[ref for ref, _ in sized],
+        )
+
+
+def pytest_collection_modifyitems(config, items):
+    # Largest decks first: xdist hands items out in collection order, so the
+    # slowest cases start early instead of straggling at the end of the run.
+    # Plain runs keep pytest's order, and only filesize-marked items trade
+    # places with each other so module/class fixtures stay grouped.
+    if os.getenv("PYTEST_XDIST_WORKER") is None:
+        return
+    marks = [item.get_closest_marker("filesize") for item in items]
+    slots = [i for i, mark in enumerate(marks) if mark is not None]
+    ranked = [items[i] for i in sorted(slots, key=lambda i: marks[i].args[0], reverse=True)]
+    for i, item in zip(slots, ranked):
+        items[i] = item
 
 
 # ---------------------------------------------------------------------------
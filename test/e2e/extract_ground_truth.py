@@ -3,8 +3,15 @@ Extract structural ground truth from raw PPTX XML using zipfile + lxml.
 No python-pptx dependency — reads the XML directly for maximum fidelity.
 """
 
+import functools
+import hashlib
+import os
+import pickle
 import re
+import sys
+import threading
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from lxml import etree
@@ -32,6 +39,28 @@ NS = {
     "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
 }
 
+# On-disk cache of extracted structures, keyed by the PPTX content hash.
+# Bump GT_CACHE_VERSION whenever parser output or the models change shape.
+GT_CACHE_DIR = Path(__file__).resolve().parent / "baselines" / ".gt_cache"
+GT_CACHE_VERSION = 3
+# Set by conftest under --update-baselines: re-extract and overwrite entries.
+GT_CACHE_REFRESH = False
+
+# Paragraph texts shorter than this are interned: template-cloned decks repeat
+# the same short strings ("Click to edit", footers, bullets) many times.
+INTERN_TEXT_MAX_LEN = 64
+
+# Decks with fewer slides than this are parsed inline — process pool startup
+# costs more than it saves on tiny decks.
+PARALLEL_SLIDE_THRESHOLD = 4
+
+# Larger decks share one lazily started process pool of at most this many
+# workers.  Under pytest-xdist each worker is already a process per core, so
+# slides are parsed inline there instead of oversubscribing the machine.
+PARSE_POOL_MAX_WORKERS = 4
+_parse_pool: ProcessPoolExecutor | None = None
+_parse_pool_lock = threading.Lock()
+
 # EMU to pixels at 96 DPI — matches TS emuToPx
 EMU_PER_INCH = 914400
 DPI = 96
@@ -41,6 +70,19 @@ def emu_to_px(emu: int | float) -> float:
     return (emu / EMU_PER_INCH) * DPI
 
 
+def _emus_to_px(els: list[etree._Element], name: str) -> list[float]:
+    """emu_to_px(_num_attr(el, name)) over many elements in one pass."""
+    out = []
+    for el in els:
+        val = el.get(name)
+        try:
+            emu = float(val) if val else 0.0
+        except ValueError:
+            emu = 0.0
+        out.append(emu / EMU_PER_INCH * DPI)
+    return out
+
+
 def angle_to_deg(angle: int | float) -> float:
     return angle / 60000
 
@@ -53,6 +95,14 @@ def _find(el: etree._Element, xpath: str) -> etree._Element | None:
     return el.find(xpath, NS)
 
 
+def _child(el: etree._Element, tag: str) -> etree._Element | None:
+    """First direct child with the given Clark-notation tag ({ns}local)."""
+    for child in el:
+        if child.tag == tag:
+            return child
+    return None
+
+
 def _findall(el: etree._Element, xpath: str) -> list[etree._Element]:
     return el.findall(xpath, NS)
 
@@ -73,21 +123,64 @@ def _num_attr(el: etree._Element | None, name: str, default: float = 0) -> float
         return default
 
 
+def _xpath(expr: str) -> etree.XPath:
+    return etree.XPath(expr, namespaces=NS)
+
+
+def _first(xp: etree.XPath, el: etree._Element) -> etree._Element | None:
+    found = xp(el)
+    return found[0] if found else None
+
+
+def _qn(tag: str) -> str:
+    """'p:spPr' -> '{http://...presentationml/2006/main}spPr'."""
+    prefix, local = tag.split(":")
+    return f"{{{NS[prefix]}}}{local}"
+
+
+# Compiled once at import so the per-shape hot path skips path parsing and
+# namespace-map resolution. Single-step child lookups use _child() with the
+# tags below instead — a direct scan beats dispatching into the XPath engine.
+_XP_TBL = _xpath("a:graphic/a:graphicData/a:tbl")
+_XP_GRID_COLS = _xpath("a:tblGrid/a:gridCol")
+_XP_ROWS = _xpath("a:tr")
+_XP_CELLS = _xpath("a:tc")
+_XP_PARAGRAPHS = _xpath("a:p")
+_XP_PARA_TEXT = _xpath("a:r/a:t | a:fld/a:t | a:br")
+
+_TAG_SPPR = _qn("p:spPr")
+_TAG_GRPSPPR = _qn("p:grpSpPr")
+_TAG_P_XFRM = _qn("p:xfrm")
+_TAG_CNVPR = _qn("p:cNvPr")
+_TAG_TXBODY = _qn("p:txBody")
+_TAG_CSLD = _qn("p:cSld")
+_TAG_SPTREE = _qn("p:spTree")
+_TAG_XFRM = _qn("a:xfrm")
+_TAG_OFF = _qn("a:off")
+_TAG_EXT = _qn("a:ext")
+_TAG_PRST_GEOM = _qn("a:prstGeom")
+_TAG_A_TXBODY = _qn("a:txBody")
+_TAG_PPR = _qn("a:pPr")
+_TAG_BR = _qn("a:br")
+_TAG_TBLPR = _qn("a:tblPr")
+_TAG_TABLE_STYLE_ID = _qn("a:tableStyleId")
+_TAG_TBL_STYLE = _qn("a:tblStyle")
+_NV_WRAPPER_TAGS = frozenset(
+    _qn(t) for t in (
+        "p:nvSpPr", "p:nvPicPr", "p:nvGrpSpPr",
+        "p:nvGraphicFramePr", "p:nvCxnSpPr",
+    )
+)
+
+
 # ---------------------------------------------------------------------------
 # Non-visual properties
 # ---------------------------------------------------------------------------
 
-_NV_WRAPPERS = [
-    "p:nvSpPr", "p:nvPicPr", "p:nvGrpSpPr",
-    "p:nvGraphicFramePr", "p:nvCxnSpPr",
-]
-
-
 def _get_cNvPr(el: etree._Element) -> etree._Element | None:
-    for wrapper_tag in _NV_WRAPPERS:
-        wrapper = _find(el, wrapper_tag)
-        if wrapper is not None:
-            return _find(wrapper, "p:cNvPr")
+    for child in el:
+        if child.tag in _NV_WRAPPER_TAGS:
+            return _child(child, _TAG_CNVPR)
     return None
 
 
@@ -96,23 +189,23 @@ def _get_cNvPr(el: etree._Element) -> etree._Element | None:
 # ---------------------------------------------------------------------------
 
 def _get_xfrm(el: etree._Element) -> etree._Element | None:
-    """Find xfrm in spPr, grpSpPr, or direct child."""
-    for prop_tag in ["p:spPr", "p:grpSpPr"]:
-        prop = _find(el, prop_tag)
-        if prop is not None:
-            xfrm = _find(prop, "a:xfrm")
+    """Find xfrm in spPr, grpSpPr, or direct child (graphicFrame)."""
+    for child in el:
+        tag = child.tag
+        if tag == _TAG_SPPR or tag == _TAG_GRPSPPR:
+            xfrm = _child(child, _TAG_XFRM)
             if xfrm is not None:
                 return xfrm
-    # Direct xfrm (graphicFrame)
-    xfrm = _find(el, "p:xfrm")
-    return xfrm
+        elif tag == _TAG_P_XFRM:
+            return child
+    return None
 
 
 def _parse_position_size(xfrm: etree._Element | None) -> tuple[Position, Size]:
     if xfrm is None:
         return Position(), Size()
-    off = _find(xfrm, "a:off")
-    ext = _find(xfrm, "a:ext")
+    off = _child(xfrm, _TAG_OFF)
+    ext = _child(xfrm, _TAG_EXT)
     pos = Position(
         x=emu_to_px(_num_attr(off, "x")),
         y=emu_to_px(_num_attr(off, "y")),
@@ -132,30 +225,22 @@ def _parse_text_body(txBody: etree._Element | None) -> TextBody | None:
     if txBody is None:
         return None
     paragraphs = []
-    for p_el in _findall(txBody, "a:p"):
-        pPr = _find(p_el, "a:pPr")
+    for p_el in _XP_PARAGRAPHS(txBody):
+        pPr = _child(p_el, _TAG_PPR)
         level = int(_attr(pPr, "lvl", "0")) if pPr is not None else 0
-        # Collect text from runs (a:r), line breaks (a:br), fields (a:fld)
-        parts = []
-        for child in p_el:
-            tag = etree.QName(child).localname
-            if tag == "r":
-                t_el = _find(child, "a:t")
-                if t_el is not None and t_el.text:
-                    parts.append(t_el.text)
-            elif tag == "br":
-                parts.append("\n")
-            elif tag == "fld":
-                t_el = _find(child, "a:t")
-                if t_el is not None and t_el.text:
-                    parts.append(t_el.text)
-        text = "".join(parts)
+        # Text from runs (a:r), fields (a:fld) and line breaks (a:br), in
+        # document order from a single libxml2 traversal
+        text = "".join(
+            "\n" if el.tag == _TAG_BR else (el.text or "")
+            for el in _XP_PARA_TEXT(p_el)
+        )
+        if len(text) < INTERN_TEXT_MAX_LEN:
+            text = sys.intern(text)
         paragraphs.append(TextParagraph(level=level, text=text))
 
-    total_text = "\n".join(p.text for p in paragraphs)
-    if not total_text.strip():
+    if not any(p.text.strip() for p in paragraphs):
         return None
-    return TextBody(paragraphs=paragraphs, total_text=total_text)
+    return TextBody(paragraphs=paragraphs)
 
 
 # ---------------------------------------------------------------------------
@@ -185,11 +270,11 @@ def _parse_base(el: etree._Element) -> dict:
 def _parse_shape(el: etree._Element) -> NodeData:
     """Parse p:sp or p:cxnSp."""
     base = _parse_base(el)
-    spPr = _find(el, "p:spPr")
-    prstGeom = _find(spPr, "a:prstGeom") if spPr is not None else None
+    spPr = _child(el, _TAG_SPPR)
+    prstGeom = _child(spPr, _TAG_PRST_GEOM) if spPr is not None else None
     preset = _attr(prstGeom, "prst") if prstGeom is not None else None
 
-    txBody = _find(el, "p:txBody")
+    txBody = _child(el, _TAG_TXBODY)
     text_body = _parse_text_body(txBody)
 
     return NodeData(
@@ -209,40 +294,36 @@ def _parse_pic(el: etree._Element) -> NodeData:
 def _parse_table(el: etree._Element) -> NodeData:
     """Parse p:graphicFrame containing a:tbl."""
     base = _parse_base(el)
-    tbl = _find(el, "a:graphic/a:graphicData/a:tbl")
+    tbl = _first(_XP_TBL, el)
     if tbl is None:
         return NodeData(**base, node_type="table")
 
     # Columns
-    tblGrid = _find(tbl, "a:tblGrid")
-    columns = []
-    if tblGrid is not None:
-        for gc in _findall(tblGrid, "a:gridCol"):
-            columns.append(emu_to_px(_num_attr(gc, "w")))
+    columns = _emus_to_px(_XP_GRID_COLS(tbl), "w")
 
     # Rows
     rows = []
-    for tr in _findall(tbl, "a:tr"):
-        height = emu_to_px(_num_attr(tr, "h"))
+    trs = _XP_ROWS(tbl)
+    for tr, height in zip(trs, _emus_to_px(trs, "h")):
         cells = []
-        for tc in _findall(tr, "a:tc"):
+        for tc in _XP_CELLS(tr):
             grid_span = int(_attr(tc, "gridSpan", "1"))
             row_span = int(_attr(tc, "rowSpan", "1"))
-            txBody = _find(tc, "a:txBody")
+            txBody = _child(tc, _TAG_A_TXBODY)
             text_body = _parse_text_body(txBody)
             cell_text = text_body.total_text if text_body else ""
             cells.append(CellData(text=cell_text, grid_span=grid_span, row_span=row_span))
         rows.append(RowData(height=height, cells=cells))
 
     # Table style
-    tblPr = _find(tbl, "a:tblPr")
+    tblPr = _child(tbl, _TAG_TBLPR)
     table_style_id = None
     if tblPr is not None:
-        tsid = _find(tblPr, "a:tableStyleId")
+        tsid = _child(tblPr, _TAG_TABLE_STYLE_ID)
         if tsid is not None and tsid.text:
             table_style_id = tsid.text
         else:
-            tblStyle = _find(tblPr, "a:tblStyle")
+            tblStyle = _child(tblPr, _TAG_TBL_STYLE)
             if tblStyle is not None:
                 table_style_id = _attr(tblStyle, "val") or tblStyle.text or None
             else:
@@ -258,68 +339,158 @@ def _parse_table(el: etree._Element) -> NodeData:
 
 
 def _parse_group(el: etree._Element) -> NodeData:
-    """Parse p:grpSp."""
+    """Parse p:grpSp. Children are filled in by _parse_children."""
     base = _parse_base(el)
-    children = []
-    for child in el:
-        tag = etree.QName(child).localname
-        node = _dispatch_child(child, tag)
-        if node is not None:
-            children.append(node)
-    return NodeData(**base, node_type="group", children=children)
-
-
-def _is_table_frame(el: etree._Element) -> bool:
-    tbl = _find(el, "a:graphic/a:graphicData/a:tbl")
-    return tbl is not None
-
-
-def _dispatch_child(child: etree._Element, tag: str) -> NodeData | None:
-    if tag in ("sp", "cxnSp"):
-        return _parse_shape(child)
-    elif tag == "pic":
-        return _parse_pic(child)
-    elif tag == "grpSp":
-        return _parse_group(child)
-    elif tag == "graphicFrame":
-        if _is_table_frame(child):
-            return _parse_table(child)
+    return NodeData(**base, node_type="group", children=[])
+
+
+def _parse_graphic_frame(el: etree._Element) -> NodeData | None:
+    """Parse p:graphicFrame; only tables are extracted."""
+    if _XP_TBL(el):
+        return _parse_table(el)
     return None
 
 
+# Keyed on the fully-qualified child.tag — avoids a QName per child and an
+# if/elif ladder. Comments/PIs have non-string tags and simply miss.
+_DISPATCH = {
+    _qn("p:sp"): _parse_shape,
+    _qn("p:cxnSp"): _parse_shape,
+    _qn("p:pic"): _parse_pic,
+    _qn("p:grpSp"): _parse_group,
+    _qn("p:graphicFrame"): _parse_graphic_frame,
+}
+
+
+def _parse_children(container: etree._Element) -> list[NodeData]:
+    """Parse the shapes under spTree, descending into groups with an explicit
+    work stack rather than recursion, so deep nesting costs no Python frames."""
+    nodes: list[NodeData] = []
+    stack = [(container, nodes)]
+    while stack:
+        parent_el, out = stack.pop()
+        for child in parent_el:
+            handler = _DISPATCH.get(child.tag)
+            if handler is None:
+                continue
+            node = handler(child)
+            if node is None:
+                continue
+            out.append(node)
+            if node.node_type == "group":
+                stack.append((child, node.children))
+    return nodes
+
+
 # ---------------------------------------------------------------------------
 # Slide parser
 # ---------------------------------------------------------------------------
 
 def _parse_slide_xml(slide_xml: bytes, index: int) -> SlideData:
     """Parse a single slide XML file."""
-    root = etree.fromstring(slide_xml)
+    return _parse_slide_root(etree.fromstring(slide_xml), index)
 
+
+def _parse_slide_root(root: etree._Element, index: int) -> SlideData:
+    """Parse an already-parsed p:sld root element."""
     # Detect hidden slides (show="0" on p:sld element)
     hidden = root.get("show") == "0"
 
-    cSld = _find(root, "p:cSld")
+    cSld = _child(root, _TAG_CSLD)
     if cSld is None:
         return SlideData(index=index, hidden=hidden)
 
-    spTree = _find(cSld, "p:spTree")
+    spTree = _child(cSld, _TAG_SPTREE)
     if spTree is None:
         return SlideData(index=index, hidden=hidden)
 
-    nodes = []
-    for child in spTree:
-        tag = etree.QName(child).localname
-        node = _dispatch_child(child, tag)
-        if node is not None:
-            nodes.append(node)
-
+    nodes = _parse_children(spTree)
     return SlideData(index=index, nodes=nodes, hidden=hidden)
 
 
+def _parse_slide_part(zf: zipfile.ZipFile, target: str, index: int) -> SlideData:
+    """Parse a slide straight from its zip member, without an intermediate bytes copy."""
+    try:
+        src = zf.open(target)
+    except KeyError:
+        # Slide file not found in zip
+        return SlideData(index=index)
+    with src:
+        return _parse_slide_root(etree.parse(src).getroot(), index)
+
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(max_workers=min(PARSE_POOL_MAX_WORKERS, os.cpu_count() or 1))
+        return _parse_pool
+
+
+def _parse_slides_parallel(zf: zipfile.ZipFile, targets: list[str]) -> list[SlideData]:
+    """Parse slides in a process pool; workers receive raw bytes since zip handles can't be pickled."""
+    slides = [SlideData(index=i) for i in range(len(targets))]
+    present = []
+    for i, target in enumerate(targets):
+        try:
+            present.append((zf.read(target), i))
+        except KeyError:
+            # Slide file not found in zip
+            pass
+    if present:
+        for slide_data in _get_parse_pool().map(_parse_slide_xml, *zip(*present)):
+            slides[slide_data.index] = slide_data
+    return slides
+
+
+_SLIDE_NUM_RE = re.compile(r"(\d+)")
+
+
+def _slide_number(target: str) -> int:
+    """Sort key for the fallback slide ordering: first number in the part path."""
+    m = _SLIDE_NUM_RE.search(target)
+    return int(m.group(1)) if m else 0
+
+
+# ---------------------------------------------------------------------------
+# Disk cache
+# ---------------------------------------------------------------------------
+
+def _disk_cached(fn):
+    """Cache a pptx_path -> PresentationStructure function under GT_CACHE_DIR."""
+
+    @functools.wraps(fn)
+    def wrapper(pptx_path: str | Path) -> PresentationStructure:
+        pptx_path = Path(pptx_path)
+        digest = hashlib.sha256(pptx_path.read_bytes()).hexdigest()
+        cache_path = GT_CACHE_DIR / f"v{GT_CACHE_VERSION}-{digest}.pkl"
+
+        if not GT_CACHE_REFRESH:
+            try:
+                with cache_path.open("rb") as f:
+                    return pickle.load(f)
+            except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+                # Missing, corrupt, or incompatible entry — rebuild it
+                pass
+
+        result = fn(pptx_path)
+
+        GT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent workers never read a partial pickle
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        with tmp_path.open("wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        return result
+
+    return wrapper
+
+
 # ---------------------------------------------------------------------------
 # Main extractor
 # ---------------------------------------------------------------------------
 
+@_disk_cached
 def extract_ground_truth(pptx_path: str | Path) -> PresentationStructure:
     """
     Extract structural ground truth from a PPTX file.
@@ -363,25 +534,20 @@ def extract_ground_truth(pptx_path: str | Path) -> PresentationStructure:
 
         # Fallback: sort by slide number
         if not ordered_targets:
-            slide_files = sorted(
-                rid_to_target.values(),
-                key=lambda t: int(re.search(r"(\d+)", t).group(1)) if re.search(r"(\d+)", t) else 0,
-            )
+            slide_files = sorted(rid_to_target.values(), key=_slide_number)
             for target in slide_files:
                 if not target.startswith("ppt/"):
                     target = "ppt/" + target.lstrip("/")
                 ordered_targets.append(target)
 
         # --- Parse each slide ---
-        slides = []
-        for i, target in enumerate(ordered_targets):
-            try:
-                slide_xml = zf.read(target)
-                slide_data = _parse_slide_xml(slide_xml, i)
-                slides.append(slide_data)
-            except KeyError:
-                # Slide file not found in zip
-                slides.append(SlideData(index=i))
+        if len(ordered_targets) >= PARALLEL_SLIDE_THRESHOLD and os.getenv("PYTEST_XDIST_WORKER") is None:
+            slides = _parse_slides_parallel(zf, ordered_targets)
+        else:
+            slides = [
+                _parse_slide_part(zf, target, i)
+                for i, target in enumerate(ordered_targets)
+            ]
 
     return PresentationStructure(
         width=width,
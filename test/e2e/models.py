@@ -6,44 +6,47 @@ ground truth (PPTX XML) and renderer output (serialized JSON).
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     x: float = 0.0
     y: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class Size:
     w: float = 0.0
     h: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class TextParagraph:
     level: int = 0
     text: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class TextBody:
     paragraphs: list[TextParagraph] = field(default_factory=list)
-    total_text: str = ""
 
+    @property
+    def total_text(self) -> str:
+        return "\n".join(p.text for p in self.paragraphs)
 
-@dataclass
+
+@dataclass(slots=True)
 class CellData:
     text: str = ""
     grid_span: int = 1
     row_span: int = 1
 
 
-@dataclass
+@dataclass(slots=True)
 class RowData:
     height: float = 0.0
     cells: list[CellData] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class NodeData:
     id: str = ""
     name: str = ""
@@ -61,14 +64,14 @@ class NodeData:
     children: list["NodeData"] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SlideData:
     index: int = 0
     nodes: list[NodeData] = field(default_factory=list)
     hidden: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class PresentationStructure:
     width: float = 0.0
     height: float = 0.0
@@ -67,101 +67,52 @@ def compile_case_to_spec(
                 if shape_token is None:
                     shape_token = node["shape"]
                 lines.append(
-                    "|".join(
-                        [
-                            "SHAPE",
-                            str(shape_token),
-                            _as_num(node["left"]),
-                            _as_num(node["top"]),
-                            _as_num(node["width"]),
-                            _as_num(node["height"]),
-                        ]
-                    )
+                    f"SHAPE|{shape_token}|{_as_num(node['left'])}|{_as_num(node['top'])}"
+                    f"|{_as_num(node['width'])}|{_as_num(node['height'])}"
                 )
             elif kind == "smartart":
                 lines.append(
-                    "|".join(
-                        [
-                            "SMARTART",
-                            str(node["layout"]),
-                            _as_num(node["left"]),
-                            _as_num(node["top"]),
-                            _as_num(node["width"]),
-                            _as_num(node["height"]),
-                        ]
-                    )
+                    f"SMARTART|{node['layout']}|{_as_num(node['left'])}|{_as_num(node['top'])}"
+                    f"|{_as_num(node['width'])}|{_as_num(node['height'])}"
                 )
             elif kind == "chart":
                 lines.append(
-                    "|".join(
-                        [
-                            "CHART",
-                            str(node["chartTypeId"]),
-                            _as_num(node["left"]),
-                            _as_num(node["top"]),
-                            _as_num(node["width"]),
-                            _as_num(node["height"]),
-                        ]
-                    )
+                    f"CHART|{node['chartTypeId']}|{_as_num(node['left'])}|{_as_num(node['top'])}"
+                    f"|{_as_num(node['width'])}|{_as_num(node['height'])}"
                 )
             elif kind == "table":
                 lines.append(
-                    "|".join(
-                        [
-                            "TABLE",
-                            str(node["rows"]),
-                            str(node["cols"]),
-                            _as_num(node["left"]),
-                            _as_num(node["top"]),
-                            _as_num(node["width"]),
-                            _as_num(node["height"]),
-                        ]
-                    )
+                    f"TABLE|{node['rows']}|{node['cols']}"
+                    f"|{_as_num(node['left'])}|{_as_num(node['top'])}"
+                    f"|{_as_num(node['width'])}|{_as_num(node['height'])}"
                 )
             elif kind == "connector":
                 lines.append(
-                    "|".join(
-                        [
-                            "CONNECTOR",
-                            str(node["connectorType"]),
-                            _as_num(node["beginX"]),
-                            _as_num(node["beginY"]),
-                            _as_num(node["endX"]),
-                            _as_num(node["endY"]),
-                        ]
-                    )
+                    f"CONNECTOR|{node['connectorType']}"
+                    f"|{_as_num(node['beginX'])}|{_as_num(node['beginY'])}"
+                    f"|{_as_num(node['endX'])}|{_as_num(node['endY'])}"
                 )
             elif kind == "fillstroke":
                 lines.append(
-                    "|".join(
-                        [
-                            "FILLSTROKE",
-                            str(node["fillKind"]),
-                            str(node["strokeKind"]),
-                            _as_num(node["left"]),
-                            _as_num(node["top"]),
-                            _as_num(node["width"]),
-                            _as_num(node["height"]),
-                        ]
-                    )
+                    f"FILLSTROKE|{node['fillKind']}|{node['strokeKind']}"
+                    f"|{_as_num(node['left'])}|{_as_num(node['top'])}"
+                    f"|{_as_num(node['width'])}|{_as_num(node['height'])}"
                 )
             else:
                 text = str(node.get("text", "")).replace("|", "/")
                 lines.append(
-                    "|".join(
-                        [
-                            "TEXTBOX",
-                            text,
-                            _as_num(node["left"]),
-                            _as_num(node["top"]),
-                            _as_num(node["width"]),
-                            _as_num(node["height"]),
-                        ]
-                    )
+                    f"TEXTBOX|{text}|{_as_num(node['left'])}|{_as_num(node['top'])}"
+                    f"|{_as_num(node['width'])}|{_as_num(node['height'])}"
                 )
 
     spec_path.parent.mkdir(parents=True, exist_ok=True)
     # VBA Line Input on Windows requires CRLF; macOS VBA handles both LF and CRLF.
-    eol = "\r\n" if sys.platform == "win32" else "\n"
-    spec_path.write_text(eol.join(lines) + eol, encoding="utf-8")
+    # Encoded straight into one buffer and written in a single call — no
+    # newline translation, no intermediate joined str.
+    eol = b"\r\n" if sys.platform == "win32" else b"\n"
+    buf = bytearray()
+    for line in lines:
+        buf += line.encode("utf-8")
+        buf += eol
+    spec_path.write_bytes(buf)
     return spec_path
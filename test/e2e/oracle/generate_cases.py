@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import errno
+import functools
+import os
+import queue
 import subprocess
 import shutil
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Generator
 
 from oracle.case_compiler import compile_case_to_spec
-from oracle.powerpoint_oracle import run_macro_export
+from oracle.powerpoint_oracle import powerpoint_batch_session_win, run_macro_export
 
 
 def _robust_unlink(path: Path, retries: int = 3, delay: float = 0.5) -> None:
@@ -22,22 +29,65 @@ def _robust_unlink(path: Path, retries: int = 3, delay: float = 0.5) -> None:
             time.sleep(delay)
 
 
-def _robust_copy(src: Path, dst: Path, retries: int = 3, delay: float = 0.5) -> None:
-    """Copy with retries for Windows file handle races."""
+def _robust_move(src: Path, dst: Path, retries: int = 3, delay: float = 0.5) -> None:
+    """Move with retries for Windows file handle races.
+
+    A same-filesystem move is a rename, so no bytes are copied.  If the sink
+    and the case dir sit on different devices, fall back to copy + unlink.
+    """
     for attempt in range(retries):
         try:
-            shutil.copy2(src, dst)
+            os.replace(src, dst)
             return
         except PermissionError:
             if attempt == retries - 1:
                 raise
             time.sleep(delay)
+        except OSError as exc:
+            if exc.errno != errno.EXDEV:
+                raise
+            # Test artifacts need no mtime/mode, so skip copy2's copystat;
+            # copyfile still takes the kernel fast path (sendfile/fcopyfile).
+            shutil.copyfile(src, dst)
+            _robust_unlink(src, retries=retries, delay=delay)
+            return
 
 
 def _default_macro_runner(**kwargs):
     return run_macro_export(**kwargs)
 
 
+@contextmanager
+def _batch_macro_runner(run_macro_fn: Callable[..., object], workers: int = 1) -> Generator:
+    """Yield the macro runner to use for a whole batch of cases.
+
+    With the default runner on Windows, one ``powerpoint_batch_session_win()``
+    is shared across the batch.  It is only started by the first case that
+    actually runs a macro, so a fully cached batch never launches PowerPoint
+    and a failed launch is reported against that case.  The COM object
+    belongs to the thread that created it, so with ``workers > 1`` Windows
+    falls back to one process per case.  Custom runners (and macOS, where
+    PowerPoint already stays open between cases) pass through untouched.
+    """
+    if run_macro_fn is not _default_macro_runner:
+        yield run_macro_fn
+    elif sys.platform == "win32" and workers <= 1:
+        # _run_macro_win closes each presentation in its own finally, so a
+        # failed case leaves the shared app clean for the next one.
+        with ExitStack() as stack:
+            session = None
+
+            def run_in_session(**kwargs):
+                nonlocal session
+                if session is None:
+                    session = stack.enter_context(powerpoint_batch_session_win())
+                return session.run_export(**kwargs)
+
+            yield run_in_session
+    else:
+        yield run_macro_fn
+
+
 def _format_generation_error(exc: Exception) -> str:
     if isinstance(exc, subprocess.CalledProcessError):
         parts = [str(exc)]
@@ -62,6 +112,7 @@ def _run_case_generation(
     export_png: bool = False,
     png_width: int = 0,
     png_height: int = 0,
+    runtime_dir: Path | None = None,
 ) -> Path:
     case_d = testdata_dir / "cases" / stem
     pptx_path = case_d / "source.pptx"
@@ -75,7 +126,8 @@ def _run_case_generation(
         else:
             return pptx_path
 
-    runtime_dir = testdata_dir / "oracle-runtime"
+    if runtime_dir is None:
+        runtime_dir = testdata_dir / "oracle-runtime"
     spec_path = runtime_dir / "_macro-spec.txt"
     runtime_dir.mkdir(parents=True, exist_ok=True)
     case_d.mkdir(parents=True, exist_ok=True)
@@ -113,16 +165,16 @@ def _run_case_generation(
     if not sink_pptx.exists() or not sink_pdf.exists():
         raise RuntimeError(f"Failed to generate macro sink output for {stem}")
 
-    _robust_copy(sink_pptx, pptx_path)
-    _robust_copy(sink_pdf, pdf_path)
+    _robust_move(sink_pptx, pptx_path)
+    _robust_move(sink_pdf, pdf_path)
 
-    # Copy PNG ground-truth files if generated
-    for sink_png in sorted(runtime_dir.glob("_macro-output_slide*.png")):
+    # Move PNG ground-truth files if generated: _macro-output_slide1.png → slide1.png
+    sink_pngs = list(runtime_dir.glob("_macro-output_slide*.png"))
+    if sink_pngs:
         slides_d.mkdir(parents=True, exist_ok=True)
-        # _macro-output_slide1.png → slide1.png
+    for sink_png in sink_pngs:
         num = sink_png.stem.split("_slide")[1]
-        dest_png = slides_d / f"slide{num}.png"
-        _robust_copy(sink_png, dest_png)
+        _robust_move(sink_png, slides_d / f"slide{num}.png")
 
     if not pptx_path.exists() or not pdf_path.exists():
         raise RuntimeError(f"Failed to materialize pair for {stem}")
@@ -130,8 +182,16 @@ def _run_case_generation(
     return pptx_path
 
 
+@functools.lru_cache(maxsize=4)
+def _scan_case_json_paths(cases_dir: str, mtime_ns: int) -> tuple[Path, ...]:
+    # mtime_ns is only part of the cache key: adding, removing or renaming a
+    # case file bumps the directory mtime and forces a fresh scan.
+    with os.scandir(cases_dir) as it:
+        return tuple(sorted(Path(e.path) for e in it if e.name.endswith(".json") and e.is_file()))
+
+
 def _iter_case_json_paths(cases_dir: Path, case_names: set[str] | None) -> list[Path]:
-    all_cases = sorted(cases_dir.glob("*.json"))
+    all_cases = list(_scan_case_json_paths(str(cases_dir), cases_dir.stat().st_mtime_ns))
     if not case_names:
         return all_cases
     selected = {name.strip() for name in case_names if name and name.strip()}
@@ -140,6 +200,75 @@ def _iter_case_json_paths(cases_dir: Path, case_names: set[str] | None) -> list[
     return [p for p in all_cases if p.stem in selected]
 
 
+def _sink_dirs(runtime_dir: Path, workers: int) -> list[Path]:
+    """Fixed per-worker sink directories under runtime_dir.
+
+    A single worker keeps the historical flat layout; with more workers each
+    slot gets its own ``w{n}`` directory so concurrent macros never share the
+    ``_macro-spec.txt`` / ``_macro-output.*`` sinks.  The names are stable
+    across runs, so the macOS permission prompt still fires once per slot.
+    """
+    if workers <= 1:
+        return [runtime_dir]
+    return [runtime_dir / f"w{n}" for n in range(workers)]
+
+
+def _generate_cases(
+    case_jsons: list[Path],
+    run_one: Callable[[Path, Path], Path],
+    *,
+    runtime_dir: Path,
+    workers: int,
+    fail_fast: bool,
+) -> tuple[list[Path], list[tuple[Path, Path, Exception]]]:
+    """Run ``run_one(case_json, sink_dir)`` for every case.
+
+    Results and failures come back in ``case_jsons`` order regardless of
+    completion order.  Each failure is ``(case_json, sink_dir, exc)``.  With
+    ``fail_fast`` the first exception propagates and pending cases are
+    cancelled.
+    """
+    slots: queue.SimpleQueue[Path] = queue.SimpleQueue()
+    for sink_dir in _sink_dirs(runtime_dir, workers):
+        slots.put(sink_dir)
+
+    results: dict[int, Path] = {}
+    errors: dict[int, tuple[Path, Exception]] = {}
+
+    def _task(idx: int) -> Path:
+        sink_dir = slots.get()
+        try:
+            return run_one(case_jsons[idx], sink_dir)
+        except Exception as exc:
+            errors[idx] = (sink_dir, exc)
+            raise
+        finally:
+            slots.put(sink_dir)
+
+    if workers <= 1:
+        for idx in range(len(case_jsons)):
+            try:
+                results[idx] = _task(idx)
+            except Exception:
+                if fail_fast:
+                    raise
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            futures = {ex.submit(_task, idx): idx for idx in range(len(case_jsons))}
+            for fut in as_completed(futures):
+                try:
+                    results[futures[fut]] = fut.result()
+                except Exception:
+                    if fail_fast:
+                        for pending in futures:
+                            pending.cancel()
+                        raise
+
+    generated = [results[idx] for idx in sorted(results)]
+    failures = [(case_jsons[idx], *errors[idx]) for idx in sorted(errors)]
+    return generated, failures
+
+
 def generate_all_cases(
     macro_host: Path,
     cases_dir: Path,
@@ -150,33 +279,44 @@ def generate_all_cases(
     export_png: bool = False,
     png_width: int = 0,
     png_height: int = 0,
+    workers: int = 1,
 ) -> list[Path]:
     """Generate PPTX/PDF pairs in testdata for all JSON cases in cases_dir.
 
     If export_png is True, also exports each slide as PNG via Slide.Export.
+
+    ``workers > 1`` runs cases on a thread pool with per-worker sinks.  The
+    macro host drives the *active* presentation, so only raise it when
+    run_macro_fn talks to independent PowerPoint instances.
     """
     cases_dir = Path(cases_dir)
     testdata_dir = Path(testdata_dir)
     testdata_dir.mkdir(parents=True, exist_ok=True)
 
-    generated: list[Path] = []
+    case_jsons = _iter_case_json_paths(cases_dir, case_names)
+    with _batch_macro_runner(run_macro_fn, workers) as batch_run_macro_fn:
 
-    for case_json in _iter_case_json_paths(cases_dir, case_names):
-        stem = case_json.stem
-        generated.append(
-            _run_case_generation(
+        def run_one(case_json: Path, sink_dir: Path) -> Path:
+            return _run_case_generation(
                 case_json=case_json,
-                stem=stem,
+                stem=case_json.stem,
                 macro_host=macro_host,
                 testdata_dir=testdata_dir,
-                run_macro_fn=run_macro_fn,
+                run_macro_fn=batch_run_macro_fn,
                 reuse_existing=reuse_existing,
                 export_png=export_png,
                 png_width=png_width,
                 png_height=png_height,
+                runtime_dir=sink_dir,
             )
-        )
 
+        generated, _ = _generate_cases(
+            case_jsons,
+            run_one,
+            runtime_dir=testdata_dir / "oracle-runtime",
+            workers=workers,
+            fail_fast=True,
+        )
     return generated
 
 
@@ -190,39 +330,43 @@ def generate_all_cases_resilient(
     export_png: bool = False,
     png_width: int = 0,
     png_height: int = 0,
+    workers: int = 1,
 ) -> tuple[list[Path], list[dict[str, str]]]:
     """Generate all cases and collect per-case failures without aborting the whole batch."""
     cases_dir = Path(cases_dir)
     testdata_dir = Path(testdata_dir)
     testdata_dir.mkdir(parents=True, exist_ok=True)
 
-    generated: list[Path] = []
-    failures: list[dict[str, str]] = []
+    case_jsons = _iter_case_json_paths(cases_dir, case_names)
+    with _batch_macro_runner(run_macro_fn, workers) as batch_run_macro_fn:
 
-    for case_json in _iter_case_json_paths(cases_dir, case_names):
-        stem = case_json.stem
-        try:
-            generated.append(
-                _run_case_generation(
-                    case_json=case_json,
-                    stem=stem,
-                    macro_host=macro_host,
-                    testdata_dir=testdata_dir,
-                    run_macro_fn=run_macro_fn,
-                    reuse_existing=reuse_existing,
-                    export_png=export_png,
-                    png_width=png_width,
-                    png_height=png_height,
-                )
-            )
-        except Exception as exc:  # noqa: BLE001
-            spec_path = testdata_dir / "oracle-runtime" / "_macro-spec.txt"
-            failures.append(
-                {
-                    "case": stem,
-                    "error": _format_generation_error(exc),
-                    "spec_path": str(spec_path),
-                }
+        def run_one(case_json: Path, sink_dir: Path) -> Path:
+            return _run_case_generation(
+                case_json=case_json,
+                stem=case_json.stem,
+                macro_host=macro_host,
+                testdata_dir=testdata_dir,
+                run_macro_fn=batch_run_macro_fn,
+                reuse_existing=reuse_existing,
+                export_png=export_png,
+                png_width=png_width,
+                png_height=png_height,
+                runtime_dir=sink_dir,
             )
 
+        generated, errors = _generate_cases(
+            case_jsons,
+            run_one,
+            runtime_dir=testdata_dir / "oracle-runtime",
+            workers=workers,
+            fail_fast=False,
+        )
+    failures = [
+        {
+            "case": case_json.stem,
+            "error": _format_generation_error(exc),
+            "spec_path": str(sink_dir / "_macro-spec.txt"),
+        }
+        for case_json, sink_dir, exc in errors
+    ]
     return generated, failures
@@ -1,23 +1,99 @@
 from __future__ import annotations
 
-from typing import Any
+import functools
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Iterable
 
 import cv2
 import numpy as np
-from PIL import Image
-from scipy.spatial import cKDTree
 from skimage.metrics import structural_similarity as ssim
 
 
+# On-disk cache of metric results keyed by the content of both input images,
+# so reruns over unchanged ground-truth/render pairs skip the computation.
+# Opt-in (PPTX_ORACLE_METRIC_CACHE=1): every new render pair adds an entry and
+# nothing evicts them, so the server and the test suite leave it off.
+# Bump METRIC_CACHE_VERSION whenever a cached metric's definition or the key
+# layout changes; delete the directory to drop every entry.
+METRIC_CACHE_ENABLED = os.getenv("PPTX_ORACLE_METRIC_CACHE", "") not in ("", "0")
+METRIC_CACHE_DIR = Path(__file__).resolve().parents[1] / "testdata" / ".metric-cache"
+METRIC_CACHE_VERSION = 2
+
+
+def _image_pair_digest(img1: np.ndarray, img2: np.ndarray) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for img in (img1, img2):
+        img = np.ascontiguousarray(img)
+        # Shape and dtype disambiguate equal byte streams of different layout.
+        h.update(f"{img.shape}{img.dtype.str}|".encode())
+        h.update(img.data)
+    return h.hexdigest()
+
+
+def _metric_cached(fn):
+    """Cache an (img1, img2) -> dict[str, float] metric under METRIC_CACHE_DIR.
+
+    Does nothing unless METRIC_CACHE_ENABLED.  Pass ``force=True`` to recompute
+    and overwrite the entry.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(img1: np.ndarray, img2: np.ndarray, *, force: bool = False) -> dict[str, float]:
+        if not METRIC_CACHE_ENABLED:
+            return fn(img1, img2)
+        digest = _image_pair_digest(img1, img2)
+        backend = "cuda" if _use_cuda() else "cpu"
+        if SSIM_MAX_SIDE is not None:
+            # Subsampled SSIM is a different number; keep it out of full-res entries.
+            backend += f"-ssim{SSIM_MAX_SIDE}"
+        cache_path = METRIC_CACHE_DIR / f"v{METRIC_CACHE_VERSION}-{fn.__name__}-{backend}-{digest}.json"
+
+        if not force:
+            try:
+                return json.loads(cache_path.read_bytes())
+            except (OSError, ValueError):
+                # Missing or corrupt entry — recompute it
+                pass
+
+        result = fn(img1, img2)
+
+        METRIC_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent callers never read a partial file
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(result), encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+        return result
+
+    return wrapper
+
+
+def _resize(img: np.ndarray, w: int, h: int) -> np.ndarray:
+    # Oracle and renderer usually export at matching DPI; skip the no-op
+    # resize.  Callers only read the result, so returning the input is safe.
+    if img.shape[0] == h and img.shape[1] == w:
+        return img
+    # INTER_AREA is the alias-free choice when shrinking on both axes;
+    # LANCZOS4 matches the previous PIL LANCZOS behaviour everywhere else.
+    if img.shape[0] >= h and img.shape[1] >= w:
+        interpolation = cv2.INTER_AREA
+    else:
+        interpolation = cv2.INTER_LANCZOS4
+    return cv2.resize(img, (w, h), interpolation=interpolation)
+
+
 def _resize_to_common(img1: np.ndarray, img2: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
     h = min(img1.shape[0], img2.shape[0])
     w = min(img1.shape[1], img2.shape[1])
     if h < 2 or w < 2:
         raise ValueError("images too small for comparison")
 
-    a = np.array(Image.fromarray(img1).resize((w, h), Image.LANCZOS))
-    b = np.array(Image.fromarray(img2).resize((w, h), Image.LANCZOS))
-    return a, b
+    return _resize(img1, w, h), _resize(img2, w, h)
 
 
 def _resize_to_common_max(img1: np.ndarray, img2: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
@@ -32,29 +108,167 @@ def _resize_to_common_max(img1: np.ndarray, img2: np.ndarray) -> tuple[np.ndarra
     if h < 2 or w < 2:
         raise ValueError("images too small for comparison")
 
-    a = np.array(Image.fromarray(img1).resize((w, h), Image.LANCZOS))
-    b = np.array(Image.fromarray(img2).resize((w, h), Image.LANCZOS))
-    return a, b
+    return _resize(img1, w, h), _resize(img2, w, h)
 
 
 # Canny thresholds used for edge_iou (shared by compute_edge_iou and edge_analysis).
 EDGE_CANNY_LOW, EDGE_CANNY_HIGH = 60, 120
 
+# Gray level at or above which a pixel counts as background (white canvas).
+FOREGROUND_GRAY_MAX = 245
+
+# "cuda" runs the gray conversion, Canny and foreground threshold on the GPU
+# when OpenCV was built with CUDA and a device is present, and falls back to
+# the CPU otherwise.  Opt-in: GPU Canny can differ from the CPU kernel by a
+# few edge pixels, which would make gate scores host-dependent.
+METRICS_BACKEND = "cpu"
+
+# When set, compute_visual_metrics runs SSIM on a 2x INTER_AREA downsample of
+# pairs whose longer side exceeds this many pixels (edge_iou, MAE and the
+# histogram stay at full resolution).  On 1080p slides this cuts SSIM time by
+# ~3.7x; similar pairs move by <= 0.003, but dissimilar content can drop by
+# ~0.025, enough to flip the 0.95 gate.  Opt-in for exploratory sweeps only.
+SSIM_MAX_SIDE: int | None = None
+
+
+@functools.cache
+def _cuda_device_available() -> bool:
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
 
-def compute_edge_iou(img1: np.ndarray, img2: np.ndarray) -> float:
-    a, b = _resize_to_common(img1, img2)
-    g1 = cv2.cvtColor(a, cv2.COLOR_RGB2GRAY)
-    g2 = cv2.cvtColor(b, cv2.COLOR_RGB2GRAY)
 
-    e1 = cv2.Canny(g1, EDGE_CANNY_LOW, EDGE_CANNY_HIGH) > 0
-    e2 = cv2.Canny(g2, EDGE_CANNY_LOW, EDGE_CANNY_HIGH) > 0
+def _use_cuda() -> bool:
+    return METRICS_BACKEND == "cuda" and _cuda_device_available()
+
+
+def _cuda_planes(
+    a: np.ndarray, b: np.ndarray
+) -> tuple[tuple[np.ndarray, ...], tuple[np.ndarray, ...], tuple[np.ndarray, ...]]:
+    """(grays, edges, masks) for both images, computed on the GPU.
+
+    Each call gets its own stream so concurrent metric threads never share
+    one; uploads and kernels for both images are queued before a single sync.
+    """
+    stream = cv2.cuda_Stream()
+    canny = cv2.cuda.createCannyEdgeDetector(EDGE_CANNY_LOW, EDGE_CANNY_HIGH)
+    pending = []
+    for img in (a, b):
+        src = cv2.cuda_GpuMat()
+        src.upload(img, stream)
+        gray = cv2.cuda.cvtColor(src, cv2.COLOR_RGB2GRAY, stream=stream)
+        edge = canny.detect(gray, stream=stream)
+        # gray < FOREGROUND_GRAY_MAX  <=>  not (gray > FOREGROUND_GRAY_MAX - 1)
+        _, mask = cv2.cuda.threshold(gray, FOREGROUND_GRAY_MAX - 1, 1, cv2.THRESH_BINARY_INV, stream=stream)
+        pending.append((gray.download(stream), edge.download(stream), mask.download(stream)))
+    stream.waitForCompletion()
+    (g1, e1, m1), (g2, e2, m2) = pending
+    return (g1, g2), (e1 > 0, e2 > 0), (m1.view(bool), m2.view(bool))
+
+
+@dataclass
+class _PreparedPair:
+    """An image pair already resized to a common shape.
+
+    Derived planes (gray, Canny edges, foreground masks, HSV) are computed on
+    first access and then shared by every metric that reads them.
+    """
 
-    union = np.logical_or(e1, e2).sum()
+    a: np.ndarray
+    b: np.ndarray
+    cuda: bool = False
+
+    @cached_property
+    def _gpu(self):
+        return _cuda_planes(self.a, self.b)
+
+    @cached_property
+    def grays(self) -> tuple[np.ndarray, np.ndarray]:
+        if self.cuda:
+            return self._gpu[0]
+        return cv2.cvtColor(self.a, cv2.COLOR_RGB2GRAY), cv2.cvtColor(self.b, cv2.COLOR_RGB2GRAY)
+
+    @cached_property
+    def edges(self) -> tuple[np.ndarray, np.ndarray]:
+        if self.cuda:
+            return self._gpu[1]
+        return _canny_pair(self.grays, EDGE_CANNY_LOW, EDGE_CANNY_HIGH)
+
+    @cached_property
+    def masks(self) -> tuple[np.ndarray, np.ndarray]:
+        if self.cuda:
+            return self._gpu[2]
+        g1, g2 = self.grays
+        return g1 < FOREGROUND_GRAY_MAX, g2 < FOREGROUND_GRAY_MAX
+
+    @cached_property
+    def hsvs(self) -> tuple[np.ndarray, np.ndarray]:
+        return cv2.cvtColor(self.a, cv2.COLOR_RGB2HSV), cv2.cvtColor(self.b, cv2.COLOR_RGB2HSV)
+
+
+def _prep_pair(img1: np.ndarray, img2: np.ndarray, *, upscale: bool = False) -> _PreparedPair:
+    """Resize once (to the min shape, or the max with *upscale*) and wrap for reuse."""
+    resize = _resize_to_common_max if upscale else _resize_to_common
+    return _PreparedPair(*resize(img1, img2), cuda=_use_cuda())
+
+
+def _canny_pair(
+    grays: tuple[np.ndarray, np.ndarray], low: int, high: int
+) -> tuple[np.ndarray, np.ndarray]:
+    return cv2.Canny(grays[0], low, high) > 0, cv2.Canny(grays[1], low, high) > 0
+
+
+def _inter_union(m1: np.ndarray, m2: np.ndarray) -> tuple[int, int]:
+    """Pixel counts of the intersection and union of two 0/1 masks (bool or uint8)."""
+    if hasattr(np, "bitwise_count"):
+        # NumPy >= 2.0: pack 8 pixels per byte and popcount, so the and/or
+        # and the reduction touch an eighth of the memory.  Whole uint64
+        # words when the packed length allows it.
+        p1 = np.packbits(m1, axis=None)
+        p2 = np.packbits(m2, axis=None)
+        if p1.size % 8 == 0:
+            p1 = p1.view(np.uint64)
+            p2 = p2.view(np.uint64)
+        inter = int(np.bitwise_count(p1 & p2).sum(dtype=np.int64))
+        union = int(np.bitwise_count(p1 | p2).sum(dtype=np.int64))
+        return inter, union
+    u1 = m1.view(np.uint8)
+    u2 = m2.view(np.uint8)
+    return cv2.countNonZero(cv2.bitwise_and(u1, u2)), cv2.countNonZero(cv2.bitwise_or(u1, u2))
+
+
+def _edge_iou_from(e1: np.ndarray, e2: np.ndarray) -> float:
+    inter, union = _inter_union(e1, e2)
     if union == 0:
         return 1.0
+    return inter / union
 
-    inter = np.logical_and(e1, e2).sum()
-    return float(inter / union)
+
+def _ssim_win_size(a: np.ndarray) -> int:
+    h, w = a.shape[0], a.shape[1]
+    win_size = min(7, h, w)
+    if win_size % 2 == 0:
+        win_size -= 1
+    if win_size < 3:
+        win_size = 3
+    return win_size
+
+
+def _ssim_from(a: np.ndarray, b: np.ndarray) -> float:
+    return float(ssim(a, b, channel_axis=2, win_size=_ssim_win_size(a)))
+
+
+def _mae_from(a: np.ndarray, b: np.ndarray) -> float:
+    # absdiff stays in uint8; cv2.mean returns per-channel means (padded to 4),
+    # and every channel has the same pixel count, so their average is the MAE.
+    diff = cv2.absdiff(a, b)
+    channels = diff.shape[2] if diff.ndim == 3 else 1
+    return sum(cv2.mean(diff)[:channels]) / channels / 255.0
+
+
+def compute_edge_iou(img1: np.ndarray, img2: np.ndarray) -> float:
+    return _edge_iou_from(*_prep_pair(img1, img2).edges)
 
 
 def edge_analysis(
@@ -62,48 +276,48 @@ def edge_analysis(
     img2: np.ndarray,
     low: int = EDGE_CANNY_LOW,
     high: int = EDGE_CANNY_HIGH,
+    sweep: Iterable[tuple[int, int]] = (),
 ) -> dict[str, Any]:
-    """Compute edge maps and IoU for two images. For diagnostics."""
-    a, b = _resize_to_common(img1, img2)
-    g1 = cv2.cvtColor(a, cv2.COLOR_RGB2GRAY)
-    g2 = cv2.cvtColor(b, cv2.COLOR_RGB2GRAY)
-    e1 = cv2.Canny(g1, low, high) > 0
-    e2 = cv2.Canny(g2, low, high) > 0
-    inter = int(np.logical_and(e1, e2).sum())
-    union = int(np.logical_or(e1, e2).sum())
-    iou = float(inter / union) if union > 0 else 1.0
+    """Compute edge maps and IoU for two images. For diagnostics.
+
+    Each ``(low, high)`` in *sweep* adds its edge IoU under ``"sweep"``,
+    re-running only Canny on the grays already prepared for this pair.
+    """
+    pair = _prep_pair(img1, img2)
+
+    def _edges(low: int, high: int) -> tuple[np.ndarray, np.ndarray]:
+        if (low, high) == (EDGE_CANNY_LOW, EDGE_CANNY_HIGH):
+            return pair.edges
+        return _canny_pair(pair.grays, low, high)
+
+    e1, e2 = _edges(low, high)
+    inter, union = _inter_union(e1, e2)
+    iou = inter / union if union > 0 else 1.0
     return {
         "e1": e1,
         "e2": e2,
         "inter": inter,
         "union": union,
         "edge_iou": iou,
-        "n1": int(e1.sum()),
-        "n2": int(e2.sum()),
+        "n1": int(np.count_nonzero(e1)),
+        "n2": int(np.count_nonzero(e2)),
+        "sweep": {
+            (lo, hi): iou if (lo, hi) == (low, high) else _edge_iou_from(*_edges(lo, hi))
+            for lo, hi in sweep
+        },
     }
 
 
-def compute_color_histogram_correlation(img1: np.ndarray, img2: np.ndarray) -> float:
-    """Compare color distributions using histogram correlation in HSV space.
-
-    Computes per-channel histograms (H, S, V) and returns the average
-    correlation across channels.  Values range from -1 (inverse) to 1
-    (identical distribution); typical passing score is ≥ 0.85.
-
-    Only foreground pixels (gray < 245) are included so that large white
-    backgrounds don't dominate the comparison.
-    """
-    a, b = _resize_to_common_max(img1, img2)
-    hsv1 = cv2.cvtColor(a, cv2.COLOR_RGB2HSV)
-    hsv2 = cv2.cvtColor(b, cv2.COLOR_RGB2HSV)
-
-    # Mask: only compare foreground (non-white) pixels
-    mask1 = (cv2.cvtColor(a, cv2.COLOR_RGB2GRAY) < 245).astype(np.uint8)
-    mask2 = (cv2.cvtColor(b, cv2.COLOR_RGB2GRAY) < 245).astype(np.uint8)
+def _hist_corr_from(pair: _PreparedPair) -> float:
+    # Mask: only compare foreground (non-white) pixels.  The bool masks are
+    # shared with the shape metrics; calcHist reads them as a 0/1 uint8 view.
+    fg1, fg2 = pair.masks
+    mask1 = fg1.view(np.uint8)
+    mask2 = fg2.view(np.uint8)
 
     # If either image has no foreground, return 1.0 (both blank → match)
-    fg1_count = int(mask1.sum())
-    fg2_count = int(mask2.sum())
+    fg1_count = cv2.countNonZero(mask1)
+    fg2_count = cv2.countNonZero(mask2)
     if fg1_count == 0 and fg2_count == 0:
         return 1.0
     if fg1_count == 0 or fg2_count == 0:
@@ -120,6 +334,8 @@ def compute_color_histogram_correlation(img1: np.ndarray, img2: np.ndarray) -> f
     if min_fg < total_pixels * 0.015:
         return 1.0
 
+    # Only convert to HSV once the early exits above have been ruled out.
+    hsv1, hsv2 = pair.hsvs
     correlations = []
     # Coarse bins for robustness: fine-grained bins (180/256/256) produce
     # near-zero correlation for images with a few dominant colors because
@@ -131,40 +347,54 @@ def compute_color_histogram_correlation(img1: np.ndarray, img2: np.ndarray) -> f
     for ch, (nbins, (lo, hi)) in enumerate(zip(bins, ranges)):
         h1 = cv2.calcHist([hsv1], [ch], mask1, [nbins], [lo, hi])
         h2 = cv2.calcHist([hsv2], [ch], mask2, [nbins], [lo, hi])
-        cv2.normalize(h1, h1)
-        cv2.normalize(h2, h2)
+        # HISTCMP_CORREL is Pearson correlation, which is scale-invariant,
+        # so the histograms need no normalisation first.
         corr = cv2.compareHist(h1, h2, cv2.HISTCMP_CORREL)
         correlations.append(float(corr))
 
     return sum(correlations) / len(correlations)
 
 
-def compute_visual_metrics(img1: np.ndarray, img2: np.ndarray) -> dict[str, float]:
-    a, b = _resize_to_common(img1, img2)
-    h, w = a.shape[0], a.shape[1]
-    win_size = min(7, h, w)
-    if win_size % 2 == 0:
-        win_size -= 1
-    if win_size < 3:
-        win_size = 3
+def compute_color_histogram_correlation(img1: np.ndarray, img2: np.ndarray) -> float:
+    """Compare color distributions using histogram correlation in HSV space.
 
-    score_ssim = float(ssim(a, b, channel_axis=2, win_size=win_size))
-    score_edge = compute_edge_iou(a, b)
-    mae = float(np.mean(np.abs(a.astype(np.float32) - b.astype(np.float32))) / 255.0)
-    color_hist_corr = compute_color_histogram_correlation(img1, img2)
+    Computes per-channel histograms (H, S, V) and returns the average
+    correlation across channels.  Values range from -1 (inverse) to 1
+    (identical distribution); typical passing score is ≥ 0.85.
+
+    Only foreground pixels (gray < 245) are included so that large white
+    backgrounds don't dominate the comparison.
+    """
+    return _hist_corr_from(_prep_pair(img1, img2, upscale=True))
 
-    return {
-        "ssim": score_ssim,
-        "edge_iou": score_edge,
-        "mae": mae,
-        "color_hist_corr": color_hist_corr,
-    }
 
+def _ssim_inputs(pair: _PreparedPair) -> tuple[np.ndarray, np.ndarray]:
+    h, w = pair.a.shape[:2]
+    if SSIM_MAX_SIDE is None or max(h, w) <= SSIM_MAX_SIDE:
+        return pair.a, pair.b
+    half = (max(w // 2, 2), max(h // 2, 2))
+    return (
+        cv2.resize(pair.a, half, interpolation=cv2.INTER_AREA),
+        cv2.resize(pair.b, half, interpolation=cv2.INTER_AREA),
+    )
 
-def _foreground_mask(img: np.ndarray) -> np.ndarray:
-    gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
-    # Treat near-white as background (PPT/PDF mostly white canvas).
-    return gray < 245
+
+@_metric_cached
+def compute_visual_metrics(img1: np.ndarray, img2: np.ndarray) -> dict[str, float]:
+    pair = _prep_pair(img1, img2)
+    # The histogram compares at the larger shape; when the inputs already
+    # match, min and max coincide and the prepared pair can be shared.
+    if img1.shape[:2] == img2.shape[:2]:
+        hist_pair = pair
+    else:
+        hist_pair = _prep_pair(img1, img2, upscale=True)
+
+    return {
+        "ssim": _ssim_from(*_ssim_inputs(pair)),
+        "edge_iou": _edge_iou_from(*pair.edges),
+        "mae": _mae_from(pair.a, pair.b),
+        "color_hist_corr": _hist_corr_from(hist_pair),
+    }
 
 
 def _chamfer_distance(mask1: np.ndarray, mask2: np.ndarray) -> float:
@@ -174,53 +404,63 @@ def _chamfer_distance(mask1: np.ndarray, mask2: np.ndarray) -> float:
     mask2 (and vice-versa), then average.  Returns distance in pixels.
     If either mask is empty, returns NaN.
     """
-    pts1 = np.argwhere(mask1)  # (N, 2) — [row, col]
-    pts2 = np.argwhere(mask2)
-    if len(pts1) == 0 or len(pts2) == 0:
+    if not mask1.any() or not mask2.any():
         return float("nan")
 
-    tree2 = cKDTree(pts2)
-    tree1 = cKDTree(pts1)
-    d1to2, _ = tree2.query(pts1)  # dist from each pt1 to nearest pt2
-    d2to1, _ = tree1.query(pts2)
-    return float((d1to2.mean() + d2to1.mean()) / 2.0)
+    # distanceTransform measures each pixel's distance to the nearest zero,
+    # so invert the masks to make the foreground pixels the zeros.  The
+    # precise L2 mask gives exact Euclidean distances.
+    dt2 = cv2.distanceTransform((~mask2).astype(np.uint8), cv2.DIST_L2, cv2.DIST_MASK_PRECISE)
+    dt1 = cv2.distanceTransform((~mask1).astype(np.uint8), cv2.DIST_L2, cv2.DIST_MASK_PRECISE)
+    d1to2 = dt2[mask1].mean(dtype=np.float64)  # dist from each pt1 to nearest pt2
+    d2to1 = dt1[mask2].mean(dtype=np.float64)
+    return float((d1to2 + d2to1) / 2.0)
+
 
+def _mask_stats(mask: np.ndarray) -> tuple[int, float, float]:
+    """Foreground area and centroid (row, col) of a bool mask in one pass.
 
+    Raw image moments give the pixel count (m00) and coordinate sums
+    (m01, m10) without materialising an argwhere index array.
+    """
+    m = cv2.moments(mask.view(np.uint8), binaryImage=True)
+    area = int(m["m00"])
+    if area == 0:
+        return 0, 0.0, 0.0
+    return area, m["m01"] / area, m["m10"] / area
+
+
+@_metric_cached
 def compute_foreground_shape_metrics(img1: np.ndarray, img2: np.ndarray) -> dict[str, float]:
-    a, b = _resize_to_common(img1, img2)
-    m1 = _foreground_mask(a)
-    m2 = _foreground_mask(b)
+    m1, m2 = _prep_pair(img1, img2).masks
 
-    inter = np.logical_and(m1, m2).sum()
-    union = np.logical_or(m1, m2).sum()
-    fg_iou = float(inter / union) if union > 0 else 1.0
+    inter, union = _inter_union(m1, m2)
+    fg_iou = inter / union if union > 0 else 1.0
 
     # Tolerant fg_iou: dilate both masks by 1px before computing IoU.
     # This absorbs anti-aliasing / sub-pixel positional differences that
     # penalise thin-stroke shapes (brackets, braces, arc, lineInv).
+    # Dilate the zero-copy uint8 views and count the 0/1 results directly.
     kernel = np.ones((3, 3), np.uint8)
-    m1d = cv2.dilate(m1.astype(np.uint8), kernel, iterations=1).astype(bool)
-    m2d = cv2.dilate(m2.astype(np.uint8), kernel, iterations=1).astype(bool)
-    inter_t = np.logical_and(m1d, m2d).sum()
-    union_t = np.logical_or(m1d, m2d).sum()
-    fg_iou_tolerant = float(inter_t / union_t) if union_t > 0 else 1.0
-
-    area1 = m1.sum()
-    area2 = m2.sum()
+    m1d = cv2.dilate(m1.view(np.uint8), kernel, iterations=1)
+    m2d = cv2.dilate(m2.view(np.uint8), kernel, iterations=1)
+    inter_t, union_t = _inter_union(m1d, m2d)
+    fg_iou_tolerant = inter_t / union_t if union_t > 0 else 1.0
+
+    area1, y1, x1 = _mask_stats(m1)
+    area2, y2, x2 = _mask_stats(m2)
     if area1 == 0 and area2 == 0:
         area_ratio = 1.0
     elif max(area1, area2) == 0:
         area_ratio = 0.0
     else:
-        area_ratio = float(min(area1, area2) / max(area1, area2))
+        area_ratio = min(area1, area2) / max(area1, area2)
 
     h, w = m1.shape
     diag = float((h * h + w * w) ** 0.5)
     if area1 == 0 or area2 == 0:
         centroid_dist = 1.0
     else:
-        y1, x1 = np.argwhere(m1).mean(axis=0)
-        y2, x2 = np.argwhere(m2).mean(axis=0)
         centroid_dist = float((((y1 - y2) ** 2 + (x1 - x2) ** 2) ** 0.5) / max(diag, 1.0))
 
     # Chamfer score: 1 - normalised symmetric Chamfer Distance.
@@ -78,11 +78,27 @@ def _build_macro_inline_cmd(
     return cmd
 
 
-def _is_applescript_parse_error(exc: Exception) -> bool:
+_APPLESCRIPT_PARSE_ERROR_MARKERS = ("(-2741)", "Expected end of line")
+_AUTOMATION_AUTH_ERROR_MARKERS = ("(-1743)", "Not authorized to send Apple events")
+
+
+def _called_process_mentions(exc: Exception, markers: tuple[str, ...]) -> bool:
+    """True if any marker appears in the stderr, stdout or message of *exc*.
+
+    Fields are scanned one by one, stderr first, so a hit short-circuits
+    without joining (possibly large) outputs as _called_process_text does.
+    """
     if not isinstance(exc, subprocess.CalledProcessError):
         return False
-    text = _called_process_text(exc)
-    return "(-2741)" in text or "Expected end of line" in text
+    for part in (exc.stderr, exc.stdout):
+        if part and any(marker in part for marker in markers):
+            return True
+    message = str(exc)
+    return any(marker in message for marker in markers)
+
+
+def _is_applescript_parse_error(exc: Exception) -> bool:
+    return _called_process_mentions(exc, _APPLESCRIPT_PARSE_ERROR_MARKERS)
 
 
 def _called_process_text(exc: subprocess.CalledProcessError) -> str:
@@ -96,10 +112,7 @@ def _called_process_text(exc: subprocess.CalledProcessError) -> str:
 
 
 def _is_automation_auth_error(exc: Exception) -> bool:
-    if not isinstance(exc, subprocess.CalledProcessError):
-        return False
-    text = _called_process_text(exc)
-    return "(-1743)" in text or "Not authorized to send Apple events" in text
+    return _called_process_mentions(exc, _AUTOMATION_AUTH_ERROR_MARKERS)
 
 
 def _raise_automation_auth_error(exc: subprocess.CalledProcessError):
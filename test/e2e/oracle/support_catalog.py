@@ -1,10 +1,16 @@
 from __future__ import annotations
 
 import json
+import os
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # optional: the stdlib json path below is the fallback
+    orjson = None
+
 
 SUPPORTED_STATUS = "supported"
 UNSUPPORTED_STATUS = "unsupported"
@@ -16,23 +22,48 @@ def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
+def _normalized_status(meta: dict[str, Any] | None) -> str:
+    status = str((meta or {}).get("status", UNKNOWN_STATUS)).lower().strip()
+    return status if status in ALLOWED_STATUSES else UNKNOWN_STATUS
+
+
 def load_or_init_support_catalog(catalog_path: Path, cases_dir: Path) -> dict[str, Any]:
+    """Load the catalog (or start one) and add an entry for every case JSON.
+
+    Every entry's status is normalized to one of ALLOWED_STATUSES here, so
+    readers such as select_case_names_by_scope can compare it directly.
+    """
     catalog_path = Path(catalog_path)
     cases_dir = Path(cases_dir)
 
     if catalog_path.exists():
-        catalog = json.loads(catalog_path.read_text(encoding="utf-8"))
+        data = catalog_path.read_bytes()
+        if orjson is None:
+            catalog = json.loads(data)
+        else:
+            try:
+                catalog = orjson.loads(data)
+            except orjson.JSONDecodeError:
+                # The stdlib writer emits NaN/Infinity tokens, which orjson rejects.
+                catalog = json.loads(data)
     else:
         catalog = {"version": 1, "cases": {}}
 
     cases = catalog.setdefault("cases", {})
 
-    for case_json in sorted(cases_dir.glob("*.json")):
-        entry = cases.setdefault(case_json.stem, {})
-        status = str(entry.get("status", UNKNOWN_STATUS)).lower().strip()
-        if status not in ALLOWED_STATUSES:
-            status = UNKNOWN_STATUS
-        entry["status"] = status
+    # scandir hands back names from the directory read itself; no per-entry
+    # stat or Path construction.
+    with os.scandir(cases_dir) as it:
+        stems = sorted(e.name[:-5] for e in it if e.name.endswith(".json") and e.is_file())
+
+    for stem in stems:
+        cases.setdefault(stem, {})
+    # Normalize stale entries (no case JSON on disk) as well, so the
+    # invariant holds for the whole catalog.
+    for name, entry in cases.items():
+        if not isinstance(entry, dict):
+            entry = cases[name] = {}
+        entry["status"] = _normalized_status(entry)
 
     catalog["updated_at"] = _utc_now_iso()
     return catalog
@@ -41,38 +72,42 @@ def load_or_init_support_catalog(catalog_path: Path, cases_dir: Path) -> dict[st
 def save_support_catalog(catalog_path: Path, catalog: dict[str, Any]) -> Path:
     out = Path(catalog_path)
     out.parent.mkdir(parents=True, exist_ok=True)
-    catalog = dict(catalog)
     catalog["updated_at"] = _utc_now_iso()
-    out.write_text(json.dumps(catalog, indent=2, ensure_ascii=False), encoding="utf-8")
+    if orjson is not None:
+        # Same document as the json.dump call below, an order of magnitude
+        # faster.  Not the same bytes: floats such as 1e-05 are spelled
+        # 0.00001, and NaN becomes null.
+        out.write_bytes(orjson.dumps(catalog, option=orjson.OPT_INDENT_2))
+        return out
+    # Stream into the file rather than building the whole document as one str.
+    with out.open("w", encoding="utf-8", buffering=1 << 20) as fp:
+        json.dump(catalog, fp, indent=2, ensure_ascii=False)
     return out
 
 
 def select_case_names_by_scope(catalog: dict[str, Any], scope: str) -> set[str]:
     scope_key = str(scope).lower().strip()
     cases = catalog.get("cases", {})
-    selected: set[str] = set()
-
-    for name, meta in cases.items():
-        status = str((meta or {}).get("status", UNKNOWN_STATUS)).lower().strip()
-        if status not in ALLOWED_STATUSES:
-            status = UNKNOWN_STATUS
-
-        if scope_key == "all":
-            selected.add(name)
-        elif scope_key == "unsupported":
-            if status != SUPPORTED_STATUS:
-                selected.add(name)
-        elif scope_key == "unknown":
-            if status == UNKNOWN_STATUS:
-                selected.add(name)
-        else:
-            raise ValueError(f"unsupported scope: {scope}")
 
-    return selected
+    # The scope is fixed for the call: pick the filter once, not per case.
+    # Statuses are canonical (see load_or_init_support_catalog).
+    if scope_key == "all":
+        return set(cases)
+    if scope_key == "unsupported":
+        return {name for name, meta in cases.items() if (meta or {}).get("status") != SUPPORTED_STATUS}
+    if scope_key == "unknown":
+        return {
+            name
+            for name, meta in cases.items()
+            if (meta or {}).get("status", UNKNOWN_STATUS) == UNKNOWN_STATUS
+        }
+    raise ValueError(f"unsupported scope: {scope}")
 
 
 def merge_case_results_into_catalog(catalog: dict[str, Any], case_results: list[dict[str, Any]]) -> None:
     cases = catalog.setdefault("cases", {})
+    # One merge is one observation; every row shares its timestamp.
+    seen_at = _utc_now_iso()
     for row in case_results:
         name = str(row.get("case", "")).strip()
         if not name:
@@ -84,5 +119,10 @@ def merge_case_results_into_catalog(catalog: dict[str, Any], case_results: list[
         entry["last_run_passed"] = passed
         reasons = row.get("reasons") or []
         if isinstance(reasons, list):
-            entry["last_reasons"] = [str(x) for x in reasons]
-        entry["last_seen_at"] = _utc_now_iso()
+            # Report rows already carry str labels; a plain copy is enough
+            # then.  Always copy so the entry never aliases the caller's row.
+            if all(type(x) is str for x in reasons):
+                entry["last_reasons"] = list(reasons)
+            else:
+                entry["last_reasons"] = [str(x) for x in reasons]
+        entry["last_seen_at"] = seen_at
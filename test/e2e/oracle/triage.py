@@ -1,8 +1,22 @@
 from __future__ import annotations
 
+import functools
+from operator import itemgetter
 from typing import Iterable
 
 
+# Only a handful of metric keys exist; build each label string once and share
+# it across every case instead of re-formatting it per call.
+@functools.cache
+def _metric_label(key: str) -> str:
+    return f"metric:{key}"
+
+
+@functools.cache
+def _missing_label(key: str) -> str:
+    return f"metric:missing:{key}"
+
+
 def classify_case_outcome(
     summary: dict[str, float],
     thresholds: dict[str, float],
@@ -18,31 +32,27 @@ def classify_case_outcome(
     for key, min_value in thresholds.items():
         value = summary.get(key)
         if value is None:
-            reasons.append(f"metric:missing:{key}")
+            reasons.append(_missing_label(key))
             continue
         if value < min_value:
-            reasons.append(f"metric:{key}")
+            reasons.append(_metric_label(key))
 
+    # Both geometry heuristics need low foreground overlap; most cases clear
+    # that bar, so the SSIM reads are skipped for them.
     fg_iou = float(summary.get("fg_iou", 1.0))
-    ssim = float(summary.get("ssim", 1.0))
-
-    if fg_iou < 0.12 and ssim < 0.50:
-        reasons.append("likely:shape_missing_or_wrong_geometry")
-    if fg_iou < 0.15 and ssim >= float(thresholds.get("ssim", 0.70)):
-        reasons.append("warn:low_foreground_overlap_check_manually")
+    if fg_iou < 0.15:
+        ssim = float(summary.get("ssim", 1.0))
+        if fg_iou < 0.12 and ssim < 0.50:
+            reasons.append("likely:shape_missing_or_wrong_geometry")
+        if ssim >= float(thresholds.get("ssim", 0.70)):
+            reasons.append("warn:low_foreground_overlap_check_manually")
 
     return _uniq(reasons)
 
 
 def _uniq(items: Iterable[str]) -> list[str]:
-    seen: set[str] = set()
-    result: list[str] = []
-    for item in items:
-        if item in seen:
-            continue
-        seen.add(item)
-        result.append(item)
-    return result
+    # dicts keep insertion order, so this is an order-preserving dedup.
+    return list(dict.fromkeys(items))
 
 
 def build_attention_ranking(results: list[dict]) -> list[dict]:
@@ -51,8 +61,17 @@ def build_attention_ranking(results: list[dict]) -> list[dict]:
         warnings = row.get("warnings") or []
         if not warnings:
             continue
-        summary = row.get("summary") or {}
-        severity = _attention_severity(summary)
+        summary = row.get("summary")
+        if summary:
+            # Higher severity means more likely geometric mismatch.
+            severity = (
+                (1.0 - float(summary.get("fg_iou", 1.0))) * 0.50
+                + (1.0 - float(summary.get("ssim", 1.0))) * 0.25
+                + (1.0 - float(summary.get("color_hist_corr", 1.0))) * 0.25
+            )
+        else:
+            # Every metric defaults to a perfect 1.0.
+            severity = 0.0
         ranked.append(
             {
                 "case": row.get("case"),
@@ -61,7 +80,7 @@ def build_attention_ranking(results: list[dict]) -> list[dict]:
                 "severity": round(severity, 4),
             }
         )
-    ranked.sort(key=lambda x: x["severity"], reverse=True)
+    ranked.sort(key=itemgetter("severity"), reverse=True)
     return ranked
 
 
@@ -69,7 +88,7 @@ def bucket_failure(failure: dict) -> str:
     """Classify failure records into root-cause buckets for renderer capability triage."""
     if failure.get("error"):
         return "oracle_generation_failure"
-    reasons = list(failure.get("reasons", []))
+    reasons = failure.get("reasons") or ()
     if reasons and all(r == "metric:ssim" for r in reasons):
         return "fidelity_regression"
     return "unsupported_candidate"
@@ -79,28 +98,18 @@ def diagnose_fidelity_gap(case_name: str, summary: dict) -> list[str]:
     """Heuristic hints for likely renderer capability gaps behind SSIM-only failures."""
     hints: list[str] = []
     case_key = str(case_name).lower()
-    ssim = float(summary.get("ssim", 1.0))
-    fg_iou = float(summary.get("fg_iou", 1.0))
 
-    if fg_iou < 0.12:
+    if float(summary.get("fg_iou", 1.0)) < 0.12:
         hints.append("possible:smartart_subshape_geometry_mismatch")
-    if "picture" in case_key and ssim < 0.56:
+    # Plain substring tests beat a compiled alternation on names this short;
+    # SSIM is only read for picture layouts.
+    if "picture" in case_key and float(summary.get("ssim", 1.0)) < 0.56:
         hints.append("possible:smartart_picture_fill_or_mask_mismatch")
     if "hierarchy" in case_key:
         hints.append("possible:smartart_hierarchy_connector_routing_mismatch")
 
     if not hints:
         hints.append("possible:general_smartart_style_or_effect_mismatch")
-    return _uniq(hints)
+    # Each hint is appended at most once, so no dedup is needed.
+    return hints
 
-
-def _attention_severity(summary: dict) -> float:
-    # Higher severity means more likely geometric mismatch.
-    ssim = float(summary.get("ssim", 1.0))
-    fg_iou = float(summary.get("fg_iou", 1.0))
-    color_hist_corr = float(summary.get("color_hist_corr", 1.0))
-    return (
-        (1.0 - fg_iou) * 0.50
-        + (1.0 - ssim) * 0.25
-        + (1.0 - color_hist_corr) * 0.25
-    )
@@ -15,7 +15,6 @@ from pathlib import Path
 
 import cv2
 import numpy as np
-from PIL import Image
 
 E2E_DIR = Path(__file__).resolve().parents[1]
 if str(E2E_DIR) not in __import__("sys").path:
@@ -23,6 +22,19 @@ if str(E2E_DIR) not in __import__("sys").path:
 
 from oracle.metrics import edge_analysis, EDGE_CANNY_LOW, EDGE_CANNY_HIGH
 
+# Overlay colour per (pdf_edge, html_edge) code: neither, HTML only, PDF only,
+# both.  Stored in BGR so the overlay can go straight to cv2.imwrite.
+_OVERLAY_LUT_BGR = np.array([[0, 0, 0], [0, 0, 255], [255, 0, 0], [0, 255, 0]], dtype=np.uint8)
+
+
+def _read_rgb(path: Path) -> np.ndarray:
+    # IMREAD_COLOR drops alpha and expands gray/palette, like PIL's convert("RGB").
+    bgr = cv2.imread(str(path), cv2.IMREAD_COLOR)
+    if bgr is None:
+        # imread reports missing/unreadable files by returning None
+        raise FileNotFoundError(path)
+    return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+
 
 def main() -> None:
     ap = argparse.ArgumentParser(description="Edge analysis for oracle case")
@@ -39,35 +51,43 @@ def main() -> None:
     if not html_path.exists():
         raise SystemExit(f"Missing {html_path} (run evaluate for this case first)")
 
-    pdf_img = np.array(Image.open(pdf_path).convert("RGB"))
-    html_img = np.array(Image.open(html_path).convert("RGB"))
+    pdf_img = _read_rgb(pdf_path)
+    html_img = _read_rgb(html_path)
 
     out_dir = args.out_dir or (E2E_DIR / "reports" / "edge_analysis" / args.case)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    result = edge_analysis(pdf_img, html_img, low=EDGE_CANNY_LOW, high=EDGE_CANNY_HIGH)
+    result = edge_analysis(
+        pdf_img,
+        html_img,
+        low=EDGE_CANNY_LOW,
+        high=EDGE_CANNY_HIGH,
+        sweep=[(40, 80), (60, 120), (80, 160)],
+    )
     e1 = result["e1"]
     e2 = result["e2"]
     h, w = e1.shape
 
     # Save binary edge maps (white on black)
-    cv2.imwrite(str(out_dir / "pdf_edges.png"), (e1.astype(np.uint8)) * 255)
-    cv2.imwrite(str(out_dir / "html_edges.png"), (e2.astype(np.uint8)) * 255)
+    e1_img = e1.view(np.uint8) * 255
+    e2_img = e2.view(np.uint8) * 255
+    cv2.imwrite(str(out_dir / "pdf_edges.png"), e1_img)
+    cv2.imwrite(str(out_dir / "html_edges.png"), e2_img)
 
     # Overlay: green = both, red = PDF only, blue = HTML only
-    overlay = np.zeros((h, w, 3), dtype=np.uint8)
-    overlay[e1 & e2] = [0, 255, 0]
-    overlay[e1 & ~e2] = [0, 0, 255]
-    overlay[~e1 & e2] = [255, 0, 0]
-    cv2.imwrite(str(out_dir / "edge_overlay.png"), cv2.cvtColor(overlay, cv2.COLOR_RGB2BGR))
+    # One gather through a LUT indexed by (e1 << 1) | e2 instead of three
+    # masked scatters; the gather allocates and fills the buffer itself.
+    code = (e1.view(np.uint8) << 1) | e2.view(np.uint8)
+    overlay = _OVERLAY_LUT_BGR[code]
+    cv2.imwrite(str(out_dir / "edge_overlay.png"), overlay)
 
     # Side-by-side: pdf | html | overlay
-    side = np.hstack([
-        (e1.astype(np.uint8) * 255).reshape(h, w, 1).repeat(3, axis=2),
-        (e2.astype(np.uint8) * 255).reshape(h, w, 1).repeat(3, axis=2),
-        overlay,
-    ])
-    cv2.imwrite(str(out_dir / "edge_sidebyside.png"), cv2.cvtColor(side, cv2.COLOR_RGB2BGR))
+    # Fill one buffer; the gray edge maps broadcast across the channels.
+    side = np.empty((h, 3 * w, 3), dtype=np.uint8)
+    side[:, :w] = e1_img[..., None]
+    side[:, w:2 * w] = e2_img[..., None]
+    side[:, 2 * w:] = overlay
+    cv2.imwrite(str(out_dir / "edge_sidebyside.png"), side)
 
     print(f"Case: {args.case} slide {args.slide}")
     print(f"Canny: low={EDGE_CANNY_LOW}, high={EDGE_CANNY_HIGH}")
@@ -77,9 +97,8 @@ def main() -> None:
     print(f"Union:            {result['union']}")
     print(f"edge_iou:         {result['edge_iou']:.4f} ({result['edge_iou']*100:.1f}%)")
     # Sensitivity: try different Canny thresholds
-    for (low, high) in [(40, 80), (60, 120), (80, 160)]:
-        r = edge_analysis(pdf_img, html_img, low=low, high=high)
-        print(f"  Canny({low},{high}) -> edge_iou={r['edge_iou']:.3f}")
+    for (low, high), iou in result["sweep"].items():
+        print(f"  Canny({low},{high}) -> edge_iou={iou:.3f}")
     print(f"Output: {out_dir}")
     print("  pdf_edges.png, html_edges.png, edge_overlay.png (green=both, red=PDF only, blue=HTML only), edge_sidebyside.png")
 
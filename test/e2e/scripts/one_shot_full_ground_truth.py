@@ -2,12 +2,15 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import json
+import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterable, Iterator
 
 # Ensure `oracle.*` imports resolve when this script is run via file path.
 E2E_DIR = Path(__file__).resolve().parents[1]
@@ -16,11 +19,16 @@ if str(E2E_DIR) not in sys.path:
 
 import platform
 
+try:
+    import orjson
+except ImportError:  # optional: json.dumps below is the fallback
+    orjson = None
+
 from oracle.generate_cases import generate_all_cases_resilient
 from oracle.powerpoint_oracle import PowerPointExportError, run_macro_only
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SmartArtLayoutRow:
     id_value: str
     name_value: str
@@ -232,12 +240,19 @@ FILLSTROKE_CONFIGS: list[tuple[str, str]] = [
 ]
 
 
+def _iter_lines(path: Path) -> Iterator[str]:
+    """Yield the lines of a VBA output file without reading it whole."""
+    with path.open(encoding="utf-8", errors="replace") as fh:
+        yield from fh
+
+
 def _probe_valid_shape_ids(
     macro_host: Path,
     runtime_dir: Path,
     shape_id_min: int,
     shape_id_max: int,
     run_only_fn: Callable[..., object] | None = None,
+    use_cache: bool = True,
 ) -> dict[int, str]:
     """Call VBA ProbeValidShapeIds to discover which MsoAutoShapeType IDs are valid.
 
@@ -245,9 +260,27 @@ def _probe_valid_shape_ids(
     Returns a dict mapping valid numeric ID → shape name (e.g. {1: "Rectangle"}).
     VBA outputs lines as "ID|ShapeName" (new format) or plain "ID" (legacy).
 
+    The valid set only changes with the PowerPoint install, so a successful
+    probe is cached per ID range under *runtime_dir* and reused on later runs;
+    pass ``use_cache=False`` to probe again and refresh the cache.
+
     If *run_only_fn* is provided it is called instead of the default
     ``run_macro_only`` — used on Windows to share a batch COM session.
     """
+    cache_path = runtime_dir / f"_valid-shape-ids.{shape_id_min}-{shape_id_max}.json"
+    if use_cache and cache_path.exists():
+        raw = cache_path.read_bytes()
+        try:
+            cached = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            # JSON object keys are strings; the cache was written in ID order.
+            valid = {int(k): v for k, v in cached.items()}
+        except ValueError:
+            # json/orjson decode errors are ValueErrors; a corrupt cache is re-probed.
+            print(f"Ignoring unreadable probe cache {cache_path}; re-probing")
+        else:
+            print(f"Using cached valid shape IDs from {cache_path} (--no-probe-cache to re-probe)")
+            return valid
+
     runtime_dir.mkdir(parents=True, exist_ok=True)
     probe_output = runtime_dir / "_valid-shape-ids.txt"
 
@@ -261,7 +294,7 @@ def _probe_valid_shape_ids(
 
     valid: dict[int, str] = {}
     if probe_output.exists():
-        for line in probe_output.read_text(encoding="utf-8", errors="replace").splitlines():
+        for line in _iter_lines(probe_output):
             text = line.strip()
             if not text:
                 continue
@@ -275,6 +308,14 @@ def _probe_valid_shape_ids(
                 # Legacy format: plain ID without name
                 valid[int(text)] = ""
     print(f"  Found {len(valid)} valid IDs out of {shape_id_max - shape_id_min + 1}")
+    # Sorted once here; the report and the case builder rely on ID order.
+    valid = dict(sorted(valid.items()))
+    # An empty result means the macro produced nothing usable; never cache it.
+    if valid:
+        # Write-then-rename so an interrupted run never leaves a truncated cache.
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(_dump_json(valid))
+        os.replace(tmp_path, cache_path)
     return valid
 
 
@@ -297,7 +338,7 @@ def _probe_valid_chart_types(
         print("macOS detected — using static chart type fallback (no Excel engine)")
         return {
             k: v
-            for k, v in CHART_TYPE_FALLBACK.items()
+            for k, v in sorted(CHART_TYPE_FALLBACK.items())
             if chart_id_min <= k <= chart_id_max
         }
 
@@ -314,7 +355,7 @@ def _probe_valid_chart_types(
 
     valid: dict[int, str] = {}
     if probe_output.exists():
-        for line in probe_output.read_text(encoding="utf-8", errors="replace").splitlines():
+        for line in _iter_lines(probe_output):
             text = line.strip()
             if not text:
                 continue
@@ -334,17 +375,64 @@ def _probe_valid_chart_types(
                 except ValueError:
                     pass
     print(f"  Found {len(valid)} valid chart types out of {chart_id_max - chart_id_min + 1}")
-    return valid
+    return dict(sorted(valid.items()))
+
+
+_SLUG_RE = re.compile(r"[^a-zA-Z0-9]+")
+# Byte table for the ASCII fast path: lowercases A-Z and maps every other
+# non-alphanumeric byte to "-", in one C-level pass.
+_SLUG_TABLE = bytes(
+    c + 32 if 0x41 <= c <= 0x5A else c if 0x61 <= c <= 0x7A or 0x30 <= c <= 0x39 else 0x2D
+    for c in range(256)
+)
 
 
+@functools.lru_cache(maxsize=4096)
 def _slugify(value: str, *, default: str) -> str:
-    slug = re.sub(r"[^a-zA-Z0-9]+", "-", value.strip().lower()).strip("-")
+    if value.isascii():
+        # Splitting on "-" and dropping empties collapses runs and trims the
+        # ends, exactly like the regex sub + strip below.
+        slug = "-".join(filter(None, value.encode("ascii").translate(_SLUG_TABLE).decode("ascii").split("-")))
+    else:
+        slug = _SLUG_RE.sub("-", value.strip().lower()).strip("-")
     return slug or default
 
 
-def _write_json(path: Path, payload: dict) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+# json.dumps builds a fresh encoder whenever non-default options are passed;
+# the fallback path reuses this one for every case.
+_JSON_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False)
+
+
+def _dump_json(payload: dict) -> bytes:
+    if orjson is not None:
+        # Emits UTF-8 bytes directly.  Matches the fallback below byte for
+        # byte only while payloads hold no exponent-range floats (orjson
+        # writes 1e-05 as 0.00001) or NaN (orjson writes null); case payloads
+        # and the report are ints, strings and bools.  Keys of the probe maps
+        # become strings on both paths.
+        return orjson.dumps(
+            payload,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS,
+        )
+    return (_JSON_ENCODER.encode(payload) + "\n").encode("utf-8")
+
+
+def _write_json(path: Path, payload: dict) -> bytes:
+    """Write *payload* to *path* unless it already holds those bytes; return them."""
+    data = _dump_json(payload)
+    # Re-runs mostly regenerate identical cases; leave those files untouched.
+    try:
+        if path.read_bytes() == data:
+            return data
+    except FileNotFoundError:
+        pass
+    try:
+        path.write_bytes(data)
+    except FileNotFoundError:
+        # Only the first write into a new directory pays for the mkdir.
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    return data
 
 
 def _shape_case_payload(case_name: str, shape_type_id: int) -> dict:
@@ -476,6 +564,23 @@ def _fillstroke_case_payload(case_name: str, fill_kind: str, stroke_kind: str) -
     }
 
 
+def _numbered_cases(
+    cases_dir: Path,
+    kind: str,
+    entries: Iterable[tuple[str, tuple]],
+    payload_fn: Callable[..., dict],
+) -> list[tuple[Path, dict]]:
+    """Name *entries* ``oracle-full-<kind>-NNNN-<slug>`` in order and build their payloads.
+
+    Each entry is ``(slug, args)``; its payload is ``payload_fn(case_name, *args)``.
+    """
+    cases: list[tuple[Path, dict]] = []
+    for idx, (slug, args) in enumerate(entries, start=1):
+        case_name = f"oracle-full-{kind}-{idx:04d}-{slug}"
+        cases.append((cases_dir / f"{case_name}.json", payload_fn(case_name, *args)))
+    return cases
+
+
 def _export_smartart_layouts(
     macro_host: Path,
     catalog_path: Path,
@@ -490,7 +595,7 @@ def _export_smartart_layouts(
     )
 
     rows: list[SmartArtLayoutRow] = []
-    for line in catalog_path.read_text(encoding="utf-8", errors="replace").splitlines():
+    for line in _iter_lines(catalog_path):
         text = line.strip()
         if not text:
             continue
@@ -525,37 +630,62 @@ def _build_case_set(
     table_case_count = 0
     connector_case_count = 0
     fillstroke_case_count = 0
+    # Payloads are collected first and written together at the end; the
+    # files are independent, so the writes overlap on a thread pool.
+    writes: list[tuple[Path, dict]] = []
+    # Stale case files are likewise gathered and removed in one batch.
+    stale: list[Path] = []
+
+    # One directory scan up front serves every stale-file decision below,
+    # instead of a glob per invalid shape ID plus another for charts.
+    shape_prefix = "oracle-full-shapeid-"
+    existing_shape_files: dict[int, list[str]] = {}
+    existing_chart_files: list[str] = []
+    with os.scandir(cases_dir) as it:
+        for entry in it:
+            name = entry.name
+            if not name.endswith(".json"):
+                continue
+            if name.startswith(shape_prefix):
+                id_token = name[len(shape_prefix):-5].partition("-")[0]
+                if id_token.isdigit():
+                    existing_shape_files.setdefault(int(id_token), []).append(name)
+            elif name.startswith("oracle-full-chart-"):
+                existing_chart_files.append(name)
 
     if include_shapes:
+        shape_names = valid_shape_ids or {}
         for shape_id in range(shape_id_min, shape_id_max + 1):
-            old_case_name = f"oracle-full-shapeid-{shape_id:04d}"
+            # One lookup answers both "is it valid" and "what is it called":
+            # probed names are str (possibly ""), so None means not probed.
+            shape_name = shape_names.get(shape_id)
 
             # Skip IDs that PowerPoint cannot create
-            if valid_shape_ids is not None and shape_id not in valid_shape_ids:
+            if valid_shape_ids is not None and shape_name is None:
                 # Remove stale case JSONs for invalid IDs (both old and new format)
-                for p in cases_dir.glob(f"oracle-full-shapeid-{shape_id:04d}*.json"):
-                    p.unlink()
+                stale.extend(cases_dir / name for name in existing_shape_files.get(shape_id, ()))
                 shape_skipped_invalid += 1
                 continue
 
-            # Build case name with shape name slug (like SmartArt)
-            shape_name = (valid_shape_ids or {}).get(shape_id, "")
+            # Build case name with shape name slug (like SmartArt); the
+            # zero-padded ID is formatted once and shared by both names.
+            old_case_name = f"{shape_prefix}{shape_id:04d}"
             if shape_name:
                 slug = _slugify(shape_name, default="shape")
-                case_name = f"oracle-full-shapeid-{shape_id:04d}-{slug}"
+                case_name = f"{old_case_name}-{slug}"
             else:
                 case_name = old_case_name
 
             case_path = cases_dir / f"{case_name}.json"
 
-            # Clean up old-format JSON if we now have a named version
-            if case_name != old_case_name:
-                old_path = cases_dir / f"{old_case_name}.json"
-                if old_path.exists():
-                    old_path.unlink()
+            # Clean up old-format JSON if we now have a named version.  The
+            # scan above already says whether it exists, so no stat is needed.
+            old_file = f"{old_case_name}.json"
+            if case_name != old_case_name and old_file in existing_shape_files.get(shape_id, ()):
+                stale.append(cases_dir / old_file)
 
             payload = _shape_case_payload(case_name, shape_id)
-            _write_json(case_path, payload)
+            writes.append((case_path, payload))
             shape_case_count += 1
 
     if include_smartart:
@@ -565,44 +695,64 @@ def _build_case_set(
             slug = _slugify(base, default=f"layout-{idx}")
             case_name = f"oracle-full-smartart-{idx:04d}-{slug}"
             payload = _smartart_case_payload(case_name, layout_key)
-            _write_json(cases_dir / f"{case_name}.json", payload)
+            writes.append((cases_dir / f"{case_name}.json", payload))
             smartart_case_count += 1
 
     if include_charts:
-        # Clean stale chart case JSONs before rebuilding (renumbering is inevitable
-        # when switching from static catalog to probe-discovered types).
-        for stale in cases_dir.glob("oracle-full-chart-*.json"):
-            stale.unlink()
-
         chart_types = valid_chart_types if valid_chart_types is not None else CHART_TYPE_FALLBACK
-        for idx, chart_id in enumerate(sorted(chart_types.keys()), start=1):
-            slug = _slugify(chart_types[chart_id], default=f"chart-type-{chart_id}")
-            case_name = f"oracle-full-chart-{idx:04d}-{slug}"
-            payload = _chart_case_payload(case_name, chart_id)
-            _write_json(cases_dir / f"{case_name}.json", payload)
-            chart_case_count += 1
+        chart_cases = _numbered_cases(
+            cases_dir,
+            "chart",
+            (
+                (_slugify(chart_types[chart_id], default=f"chart-type-{chart_id}"), (chart_id,))
+                for chart_id in sorted(chart_types)
+            ),
+            _chart_case_payload,
+        )
+        writes.extend(chart_cases)
+        chart_case_count = len(chart_cases)
+
+        # Clean stale chart case JSONs (renumbering is inevitable when switching
+        # from static catalog to probe-discovered types).  Done after the rebuild
+        # so unchanged cases keep their files.
+        chart_files = {path.name for path, _ in chart_cases}
+        stale.extend(cases_dir / name for name in existing_chart_files if name not in chart_files)
 
     if include_tables:
-        for idx, (rows, cols, slug) in enumerate(TABLE_CONFIGS, start=1):
-            case_name = f"oracle-full-table-{idx:04d}-{slug}"
-            payload = _table_case_payload(case_name, rows, cols)
-            _write_json(cases_dir / f"{case_name}.json", payload)
-            table_case_count += 1
+        table_cases = _numbered_cases(
+            cases_dir,
+            "table",
+            ((slug, (rows, cols)) for rows, cols, slug in TABLE_CONFIGS),
+            _table_case_payload,
+        )
+        writes.extend(table_cases)
+        table_case_count = len(table_cases)
 
     if include_connectors:
-        for idx, (conn_type, slug, bx, by, ex, ey) in enumerate(CONNECTOR_CONFIGS, start=1):
-            case_name = f"oracle-full-connector-{idx:04d}-{slug}"
-            payload = _connector_case_payload(case_name, conn_type, bx, by, ex, ey)
-            _write_json(cases_dir / f"{case_name}.json", payload)
-            connector_case_count += 1
+        connector_cases = _numbered_cases(
+            cases_dir,
+            "connector",
+            ((slug, (conn_type, bx, by, ex, ey)) for conn_type, slug, bx, by, ex, ey in CONNECTOR_CONFIGS),
+            _connector_case_payload,
+        )
+        writes.extend(connector_cases)
+        connector_case_count = len(connector_cases)
 
     if include_fillstroke:
-        for idx, (fill_kind, stroke_kind) in enumerate(FILLSTROKE_CONFIGS, start=1):
-            slug = f"{fill_kind}--{stroke_kind}"
-            case_name = f"oracle-full-fillstroke-{idx:04d}-{slug}"
-            payload = _fillstroke_case_payload(case_name, fill_kind, stroke_kind)
-            _write_json(cases_dir / f"{case_name}.json", payload)
-            fillstroke_case_count += 1
+        fillstroke_cases = _numbered_cases(
+            cases_dir,
+            "fillstroke",
+            ((f"{fill_kind}--{stroke_kind}", (fill_kind, stroke_kind)) for fill_kind, stroke_kind in FILLSTROKE_CONFIGS),
+            _fillstroke_case_payload,
+        )
+        writes.extend(fillstroke_cases)
+        fillstroke_case_count = len(fillstroke_cases)
+
+    # No stale path is ever also a write target, so the two batches are
+    # independent; list() re-raises the first error, if any.
+    with ThreadPoolExecutor() as pool:
+        list(pool.map(lambda path: path.unlink(missing_ok=True), stale))
+        list(pool.map(lambda item: _write_json(*item), writes))
 
     total = shape_case_count + smartart_case_count + chart_case_count + table_case_count + connector_case_count + fillstroke_case_count
     return {
@@ -715,6 +865,11 @@ def main() -> int:
         action="store_true",
         help="Skip probe step; attempt all IDs in range (old behavior).",
     )
+    parser.add_argument(
+        "--no-probe-cache",
+        action="store_true",
+        help="Ignore the cached shape ID probe result and re-probe via PowerPoint.",
+    )
     parser.add_argument(
         "--report-path",
         type=Path,
@@ -744,6 +899,12 @@ def main() -> int:
         default=0,
         help="PNG export height in pixels (0 = PowerPoint default 96 DPI).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Generate cases on N threads with per-worker sinks (needs independent PowerPoint instances).",
+    )
 
     args = parser.parse_args()
 
@@ -768,9 +929,9 @@ def main() -> int:
     do_probe = args.probe_first and not args.no_probe
     do_probe_charts = not args.no_probe_charts
 
-    # All phases use independent PowerPoint sessions for maximum stability.
-    # Each VBA call starts/quits its own PowerPoint process — slower but
-    # ensures one failure never cascades to subsequent phases or cases.
+    # Each phase runs its own PowerPoint invocations, so one failure never
+    # cascades into the next phase.  Within Phase 4, Windows with --workers 1
+    # shares one COM session across cases (see below).
 
     # --- Phase 1A: Probe valid shape IDs (single PowerPoint session, fast) ---
     valid_shape_ids: dict[int, str] | None = None
@@ -779,6 +940,7 @@ def main() -> int:
         try:
             valid_shape_ids = _probe_valid_shape_ids(
                 macro_host, runtime_dir, args.shape_id_min, args.shape_id_max,
+                use_cache=not args.no_probe_cache,
             )
         except Exception as exc:
             probe_error = str(exc)
@@ -825,7 +987,11 @@ def main() -> int:
     )
 
     # --- Phase 4: Generate PPTX/PDF pairs (reuse cache by default) ---
-    # Each case uses its own independent PowerPoint session for fault isolation.
+    # On Windows with --workers 1, cases share one PowerPoint COM session,
+    # started by the first case that is not already cached.  Each case still
+    # opens and closes its own presentation, and a failed case is recorded
+    # without stopping the batch.  macOS and --workers > 1 run each case's
+    # macro on its own.
     generated, failures = generate_all_cases_resilient(
         macro_host=macro_host,
         cases_dir=cases_dir,
@@ -834,6 +1000,7 @@ def main() -> int:
         export_png=args.export_png and not args.no_export_png,
         png_width=args.png_width,
         png_height=args.png_height,
+        workers=args.workers,
     )
 
     generated_names = sorted(path.parent.name for path in generated)
@@ -854,11 +1021,11 @@ def main() -> int:
         "probe_enabled": do_probe,
         "probe_error": probe_error,
         "valid_shape_id_count": len(valid_shape_ids) if valid_shape_ids is not None else None,
-        "valid_shape_ids": {k: v for k, v in sorted(valid_shape_ids.items())} if valid_shape_ids is not None else None,
+        "valid_shape_ids": valid_shape_ids,
         "chart_probe_enabled": do_probe_charts,
         "chart_probe_error": chart_probe_error,
         "valid_chart_type_count": len(valid_chart_types) if valid_chart_types is not None else None,
-        "valid_chart_types": {k: v for k, v in sorted(valid_chart_types.items())} if valid_chart_types is not None else None,
+        "valid_chart_types": valid_chart_types,
         "smartart_layout_count": len(smartart_rows),
         "smartart_export_error": smartart_export_error,
         "reuse_existing": not args.no_reuse,
@@ -869,9 +1036,10 @@ def main() -> int:
         "failed_cases": failure_cases,
     }
 
-    _write_json(report_path, report)
-
-    print(json.dumps(report, indent=2, ensure_ascii=False))
+    # Encode once; stdout gets the report file's text.  Written through the
+    # text layer so a replaced stdout (no .buffer) and newline translation work.
+    report_bytes = _write_json(report_path, report)
+    sys.stdout.write(report_bytes.decode("utf-8"))
     print(f"\nreport written: {report_path}")
     return 0
 
@@ -7,7 +7,8 @@ Prerequisites:
   - testdata/cases/ contains per-case dirs with source.pptx + ground-truth.pdf
 
 Modes (can combine):
-  1) Shape ID range: scan cases dir for oracle-full-shapeid-{id:04d}*.json, POST /api/evaluate/{stem} for each.
+  1) Shape ID range: scan cases dir for oracle-full-shapeid-{id:04d}*.json, POST /api/evaluate/{stem} for each
+     (IDs without a case JSON are skipped unless --probe-missing).
   2) SmartArt from cases dir: scan dir for oracle-full-smartart-*.json, POST /api/evaluate/{stem} for each.
   3) All testdata: POST /api/evaluate-all (default when neither --shape-id-min nor --smartart-cases-dir).
 
@@ -25,21 +26,36 @@ Usage:
 Output:
   - JSON report with results[].summary.ssim, results[].summary.fg_iou, etc.
   - CSV with case, ssim, fg_iou for quick sort.
+  - <out>.partial.jsonl while running: one line per finished case, removed once
+    the report is written (kept if the run is interrupted).
 """
 
 from __future__ import annotations
 
 import argparse
 import asyncio
+import contextlib
 import csv
+import functools
 import json
-import re
+import os
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Callable
 
 import httpx
 
+try:
+    import orjson
+except ImportError:  # optional: the stdlib json path below is the fallback
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # optional (comes with uvicorn[standard]; unavailable on Windows)
+    uvloop = None
+
 E2E_DIR = Path(__file__).resolve().parents[1]
 if str(E2E_DIR) not in sys.path:
     sys.path.insert(0, str(E2E_DIR))
@@ -49,12 +65,50 @@ ORACLE_REPORTS_DIR = REPORTS_DIR / "oracle-failures"
 DEFAULT_OUT_JSON = ORACLE_REPORTS_DIR / "all-shapes-eval.json"
 
 DEFAULT_CONCURRENCY = 8
+SHAPEID_PREFIX = "oracle-full-shapeid-"
+CSV_HEADER = ["case", "ssim", "color_hist_corr", "fg_iou_tolerant", "chamfer_score", "fg_iou", "passed", "needs_review"]
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 120.0
+DEFAULT_MAX_RETRIES = 3
+
+# Failures worth another attempt: the server was briefly unreachable, dropped
+# the connection, or a proxy in front of it returned 502/504.  Read timeouts are not retried — an
+# evaluation that outlived --read-timeout will most likely do so again.
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError)
+RETRYABLE_STATUS = frozenset({502, 504})
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_MAX = 30.0
 
 
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
+def _client_limits(args: argparse.Namespace) -> httpx.Limits:
+    """Connection pool sized to the evaluation fan-out.
+
+    At most ``concurrency`` requests are in flight (the semaphore enforces it),
+    so by default that many connections are allowed and all of them are kept
+    alive between cases; httpx's stock keep-alive cap of 20 would otherwise
+    reconnect once concurrency exceeds it.
+    """
+    max_connections = args.max_connections or args.concurrency
+    max_keepalive = args.max_keepalive or max_connections
+    return httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive)
+
+
+def _client_timeout(args: argparse.Namespace) -> httpx.Timeout:
+    """Fail fast on connect, allow slow evaluations, never time out waiting for the pool."""
+    return httpx.Timeout(args.read_timeout, connect=args.connect_timeout, pool=None)
+
+
+def _case_stems(directory: Path) -> list[str]:
+    """Stems of the ``*.json`` files in *directory*, in file-name order, from one scandir."""
+    with os.scandir(directory) as it:
+        names = sorted(entry.name for entry in it if entry.name.endswith(".json"))
+    return [name[:-5] for name in names]
+
+
 def _result_from_evaluate_response(name: str, data: dict) -> dict:
     avg_ssim = data.get("avgSsim") or 0.0
     avg_fg_iou = data.get("avgFgIou") or 0.0
@@ -84,45 +138,181 @@ def _result_from_evaluate_response(name: str, data: dict) -> dict:
     }
 
 
+def _csv_row(r: dict) -> list:
+    s = r["summary"]
+    return [
+        r["case"],
+        round(s["ssim"], 4),
+        round(s.get("color_hist_corr", 0), 4),
+        round(s.get("fg_iou_tolerant", 0), 4),
+        round(s.get("chamfer_score", 0), 4),
+        round(s["fg_iou"], 4),
+        r["passed"],
+        r.get("needs_review", False),
+    ]
+
+
+def _count_case_types(results: list[dict]) -> dict[str, int]:
+    """Report counts per case type, from one pass over *results*.
+
+    Types are matched by substring and may overlap (a text case can also be a
+    composite).  If none of the main types match, everything counts as shapes.
+    """
+    counts = dict.fromkeys(
+        (
+            "shape_cases",
+            "smartart_cases",
+            "chart_cases",
+            "table_cases",
+            "connector_cases",
+            "fillstroke_cases",
+            "text_cases",
+            "shape_adj_cases",
+            "composite_cases",
+            "pypptx_cases",
+        ),
+        0,
+    )
+    for r in results:
+        case = r["case"]
+        name = case.lower()
+        if "shapeid" in name or ("oracle-shape-" in case and "smartart" not in case):
+            counts["shape_cases"] += 1
+        if "smartart" in name:
+            counts["smartart_cases"] += 1
+        elif "chart" in name:
+            counts["chart_cases"] += 1
+        if "table" in name:
+            counts["table_cases"] += 1
+        if "connector" in name:
+            counts["connector_cases"] += 1
+        if "fillstroke" in name:
+            counts["fillstroke_cases"] += 1
+        if "-text-" in name:
+            counts["text_cases"] += 1
+        if "shape-adj" in name:
+            counts["shape_adj_cases"] += 1
+        if "composite" in name:
+            counts["composite_cases"] += 1
+        if "oracle-pypptx-" in name:
+            counts["pypptx_cases"] += 1
+    main_types = (
+        "shape_cases",
+        "smartart_cases",
+        "chart_cases",
+        "table_cases",
+        "connector_cases",
+        "fillstroke_cases",
+        "pypptx_cases",
+    )
+    if not any(counts[key] for key in main_types):
+        counts["shape_cases"] = len(results)
+        counts["smartart_cases"] = 0
+    return counts
+
+
 async def _eval_one(
     client: httpx.AsyncClient,
-    sem: asyncio.Semaphore,
     api_base: str,
     case: str,
     source: str | None = None,
+    max_retries: int = 0,
 ) -> tuple[dict | None, dict | None]:
-    """Evaluate a single case. Returns (result, error) — exactly one is non-None."""
-    async with sem:
+    """Evaluate a single case. Returns (result, error) — exactly one is non-None.
+
+    Transient failures (see ``RETRYABLE_ERRORS``/``RETRYABLE_STATUS``) are retried
+    up to *max_retries* times with exponential backoff before being reported.
+    """
+    url = f"{api_base}/api/evaluate/{case}"
+    if source:
+        url += f"?source={source}"
+    for attempt in range(max(max_retries, 0) + 1):
+        can_retry = attempt < max_retries
+        backoff = min(RETRY_BACKOFF_BASE * 2**attempt, RETRY_BACKOFF_MAX)
         try:
-            url = f"{api_base}/api/evaluate/{case}"
-            if source:
-                url += f"?source={source}"
             r = await client.post(url)
-            if r.status_code == 404:
-                return None, {"case": case, "error": "not found (no .pptx+.pdf in testdata)"}
-            r.raise_for_status()
-            data = r.json()
+        except RETRYABLE_ERRORS as e:
+            if can_retry:
+                await asyncio.sleep(backoff)
+                continue
+            return None, {"case": case, "error": str(e)}
         except Exception as e:
             return None, {"case": case, "error": str(e)}
-        if "error" in data:
-            return None, {"case": case, "error": data["error"]}
-        return _result_from_evaluate_response(case, data), None
+        if can_retry and r.status_code in RETRYABLE_STATUS:
+            await asyncio.sleep(backoff)
+            continue
+        break
+    try:
+        if r.status_code == 404:
+            return None, {"case": case, "error": "not found (no .pptx+.pdf in testdata)"}
+        r.raise_for_status()
+        data = r.json()
+    except Exception as e:
+        return None, {"case": case, "error": str(e)}
+    if "error" in data:
+        return None, {"case": case, "error": data["error"]}
+    return _result_from_evaluate_response(case, data), None
 
 
 async def _eval_batch(
     client: httpx.AsyncClient,
-    sem: asyncio.Semaphore,
     api_base: str,
     cases: list[str],
     label: str,
+    concurrency: int,
     source: str | None = None,
+    progress_path: Path | None = None,
+    on_result: Callable[[dict], None] | None = None,
+    max_retries: int = 0,
 ) -> tuple[list[dict], list[dict]]:
-    """Evaluate a batch of cases concurrently. Returns (results, errors)."""
+    """Evaluate a batch of cases concurrently. Returns (results, errors) in case order.
+
+    A fixed pool of *concurrency* workers pulls cases from a queue, so only that
+    many tasks exist however long the batch is.  If *progress_path* is given,
+    each outcome is appended to it as one JSON line the moment it completes, so
+    an interrupted run keeps what it finished.  *on_result* receives each result
+    in case order, as soon as all earlier cases are done.
+    """
     if not cases:
         return [], []
-    print(f"{label}: evaluating {len(cases)} cases (concurrency={sem._value})...", file=sys.stderr)
-    tasks = [_eval_one(client, sem, api_base, c, source=source) for c in cases]
-    outcomes = await asyncio.gather(*tasks)
+    print(f"{label}: evaluating {len(cases)} cases (concurrency={concurrency})...", file=sys.stderr)
+
+    pending: asyncio.Queue[tuple[int, str]] = asyncio.Queue()
+    for item in enumerate(cases):
+        pending.put_nowait(item)
+    outcomes: list[tuple[dict | None, dict | None] | None] = [None] * len(cases)
+    emitted = 0
+
+    with contextlib.ExitStack() as stack:
+        progress = stack.enter_context(open(progress_path, "w", encoding="utf-8")) if progress_path else None
+
+        def record(i: int, outcome: tuple[dict | None, dict | None]) -> None:
+            nonlocal emitted
+            outcomes[i] = outcome
+            if progress is not None:
+                result, error = outcome
+                progress.write(json.dumps(result if result is not None else error, ensure_ascii=False) + "\n")
+                progress.flush()
+            while emitted < len(cases) and outcomes[emitted] is not None:
+                ready = outcomes[emitted][0]
+                if on_result is not None and ready is not None:
+                    on_result(ready)
+                emitted += 1
+
+        async def worker() -> None:
+            while True:
+                try:
+                    i, case = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                record(i, await _eval_one(client, api_base, case, source=source, max_retries=max_retries))
+
+        workers = [asyncio.create_task(worker()) for _ in range(max(1, min(concurrency, len(cases))))]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
     results = []
     errors = []
     for result, error in outcomes:
@@ -134,10 +324,23 @@ async def _eval_batch(
     return results, errors
 
 
+def _write_report(out_path: Path, report: dict) -> None:
+    if orjson is not None:
+        # Same document as the json.dump call below, without building a str
+        # first.  Not the same bytes: small metric floats such as 1e-05 are
+        # spelled 0.00001, and NaN becomes null.
+        out_path.write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+        return
+    # Stream into the file rather than materializing the whole report as one str.
+    with out_path.open("w", encoding="utf-8", buffering=1 << 20) as fp:
+        json.dump(report, fp, indent=2, ensure_ascii=False)
+
+
 async def async_main(args: argparse.Namespace) -> int:
     api_base = args.api_base.rstrip("/")
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
+    progress_path = out_path.with_suffix(".partial.jsonl")
     concurrency = args.concurrency
     source = args.source
 
@@ -146,9 +349,32 @@ async def async_main(args: argparse.Namespace) -> int:
     used_shape_range = False
     used_smartart_dir: str | None = None
 
-    sem = asyncio.Semaphore(concurrency)
+    # The shape, SmartArt and cases-dir passes usually point at the same
+    # directory; list each directory once and filter the names in memory.
+    case_stems = functools.cache(_case_stems)
+
+    csv_path = out_path.with_suffix(".csv")
+
+    async with contextlib.AsyncExitStack() as stack:
+        client = await stack.enter_async_context(
+            httpx.AsyncClient(limits=_client_limits(args), timeout=_client_timeout(args))
+        )
+        # CSV rows are written as results arrive, so the file is usable mid-run.
+        # It is only truncated once evaluation is about to run: a run that bails
+        # out early (e.g. API server down) leaves the previous CSV and JSON intact.
+        def open_csv() -> Callable[[dict], None] | None:
+            if not args.csv:
+                return None
+            csv_file = stack.enter_context(open(csv_path, "w", newline="", encoding="utf-8"))
+            csv_writer = csv.writer(csv_file)
+            csv_writer.writerow(CSV_HEADER)
+
+            def write_csv_row(r: dict) -> None:
+                csv_writer.writerow(_csv_row(r))
+                csv_file.flush()
+
+            return write_csv_row
 
-    async with httpx.AsyncClient(timeout=120.0) as client:
         # Collect all case names to evaluate, then fire them all concurrently
         shape_cases_to_eval: list[str] = []
         smartart_cases_to_eval: list[str] = []
@@ -167,15 +393,28 @@ async def async_main(args: argparse.Namespace) -> int:
             _scan_dir = Path(args.smartart_cases_dir or args.cases_dir or "oracle/cases-full")
             if not _scan_dir.is_absolute():
                 _scan_dir = (E2E_DIR / _scan_dir).resolve()
+            # IDs without a case JSON have no testdata either, so posting them only
+            # collects 404s; skip them unless asked (or there is nothing to scan).
+            skip_missing = _scan_dir.is_dir() and not args.probe_missing
             if _scan_dir.is_dir():
-                for p in _scan_dir.glob("oracle-full-shapeid-*.json"):
-                    m = re.match(r"oracle-full-shapeid-(\d{4})", p.stem)
-                    if m:
-                        shape_case_lookup[int(m.group(1))] = p.stem
+                id_start = len(SHAPEID_PREFIX)
+                for stem in case_stems(_scan_dir):
+                    # Fixed prefix + 4-digit ID: slicing is all the parsing needed.
+                    id_token = stem[id_start:id_start + 4]
+                    if stem.startswith(SHAPEID_PREFIX) and len(id_token) == 4 and id_token.isdecimal():
+                        shape_case_lookup[int(id_token)] = stem
 
             for shape_id in range(id_min, id_max + 1):
-                case = shape_case_lookup.get(shape_id, f"oracle-full-shapeid-{shape_id:04d}")
+                case = shape_case_lookup.get(shape_id)
+                if case is None:
+                    if skip_missing:
+                        continue
+                    case = f"{SHAPEID_PREFIX}{shape_id:04d}"
                 shape_cases_to_eval.append(case)
+            skipped = id_max - id_min + 1 - len(shape_cases_to_eval)
+            if skipped:
+                print(f"Shapes: skipping {skipped} IDs with no case JSON in {_scan_dir} "
+                      "(--probe-missing to evaluate them anyway)", file=sys.stderr)
 
         # --- SmartArt ---
         if args.smartart_cases_dir:
@@ -185,9 +424,10 @@ async def async_main(args: argparse.Namespace) -> int:
             if not cases_dir.is_dir():
                 print(f"SmartArt: not a directory: {cases_dir}", file=sys.stderr)
             else:
-                smartart_jsons = sorted(cases_dir.glob("oracle-full-smartart-*.json"))
                 used_smartart_dir = str(cases_dir)
-                smartart_cases_to_eval = [p.stem for p in smartart_jsons]
+                smartart_cases_to_eval = [
+                    stem for stem in case_stems(cases_dir) if stem.startswith("oracle-full-smartart-")
+                ]
 
         # --- Extra cases (charts, tables, connectors, fillstroke, etc.) ---
         if args.cases_dir:
@@ -198,8 +438,10 @@ async def async_main(args: argparse.Namespace) -> int:
                 print(f"Cases dir: not a directory: {cases_dir}", file=sys.stderr)
             else:
                 already_seen = set(shape_cases_to_eval) | set(smartart_cases_to_eval)
-                all_case_jsons = sorted(cases_dir.glob("oracle-*.json"))
-                extra_cases_to_eval = [p.stem for p in all_case_jsons if p.stem not in already_seen]
+                extra_cases_to_eval = [
+                    stem for stem in case_stems(cases_dir)
+                    if stem.startswith("oracle-") and stem not in already_seen
+                ]
 
         # --- pypptx cases (separate dir) ---
         if args.pypptx_cases_dir:
@@ -210,8 +452,10 @@ async def async_main(args: argparse.Namespace) -> int:
                 print(f"pypptx cases dir: not a directory: {pypptx_dir}", file=sys.stderr)
             else:
                 already_seen = set(shape_cases_to_eval) | set(smartart_cases_to_eval) | set(extra_cases_to_eval)
-                pypptx_jsons = sorted(pypptx_dir.glob("oracle-pypptx-*.json"))
-                extra_cases_to_eval.extend(p.stem for p in pypptx_jsons if p.stem not in already_seen)
+                extra_cases_to_eval.extend(
+                    stem for stem in case_stems(pypptx_dir)
+                    if stem.startswith("oracle-pypptx-") and stem not in already_seen
+                )
 
         # --- Evaluate all concurrently ---
         all_cases = shape_cases_to_eval + smartart_cases_to_eval + extra_cases_to_eval
@@ -219,8 +463,10 @@ async def async_main(args: argparse.Namespace) -> int:
             print(f"Total: {len(all_cases)} cases to evaluate (shapes={len(shape_cases_to_eval)}, "
                   f"smartart={len(smartart_cases_to_eval)}, other={len(extra_cases_to_eval)}), "
                   f"concurrency={concurrency}", file=sys.stderr)
+            write_csv_row = open_csv()
             batch_results, batch_errors = await _eval_batch(
-                client, sem, api_base, all_cases, "All cases", source=source,
+                client, api_base, all_cases, "All cases", concurrency, source=source, progress_path=progress_path,
+                on_result=write_csv_row, max_retries=args.max_retries,
             )
             results.extend(batch_results)
             errors.extend(batch_errors)
@@ -239,6 +485,7 @@ async def async_main(args: argparse.Namespace) -> int:
 
             if not test_files:
                 print("No test files (no .pptx+.pdf pairs in testdata).", file=sys.stderr)
+                open_csv()
             else:
                 print(f"Evaluating {len(test_files)} cases via POST /api/evaluate-all...", file=sys.stderr)
                 try:
@@ -248,6 +495,7 @@ async def async_main(args: argparse.Namespace) -> int:
                 except Exception as e:
                     print(f"evaluate-all failed: {e}", file=sys.stderr)
                     return 1
+                write_csv_row = open_csv()
                 files_result = body.get("files") or []
                 for data in files_result:
                     if "error" in data:
@@ -255,36 +503,17 @@ async def async_main(args: argparse.Namespace) -> int:
                         continue
                     name = data.get("testFile", "?")
                     results.append(_result_from_evaluate_response(name, data))
+                    if write_csv_row is not None:
+                        write_csv_row(results[-1])
 
-    shape_results = [r for r in results if "shapeid" in r["case"].lower() or ("oracle-shape-" in r["case"] and "smartart" not in r["case"])]
-    smartart_results = [r for r in results if "smartart" in r["case"].lower()]
-    chart_results = [r for r in results if "chart" in r["case"].lower() and "smartart" not in r["case"].lower()]
-    table_results = [r for r in results if "table" in r["case"].lower()]
-    connector_results = [r for r in results if "connector" in r["case"].lower()]
-    fillstroke_results = [r for r in results if "fillstroke" in r["case"].lower()]
-    text_results = [r for r in results if "-text-" in r["case"].lower()]
-    shape_adj_results = [r for r in results if "shape-adj" in r["case"].lower()]
-    composite_results = [r for r in results if "composite" in r["case"].lower()]
-    pypptx_results = [r for r in results if "oracle-pypptx-" in r["case"].lower()]
-    if not shape_results and not smartart_results and not chart_results and not table_results and not connector_results and not fillstroke_results and not pypptx_results:
-        shape_results = results
-        smartart_results = []
+    case_type_counts = _count_case_types(results)
 
     report = {
         "generated_at": _utc_now_iso(),
         "api_base": api_base,
         "concurrency": concurrency,
         "total_cases": len(results),
-        "shape_cases": len(shape_results),
-        "smartart_cases": len(smartart_results),
-        "chart_cases": len(chart_results),
-        "table_cases": len(table_results),
-        "connector_cases": len(connector_results),
-        "fillstroke_cases": len(fillstroke_results),
-        "text_cases": len(text_results),
-        "shape_adj_cases": len(shape_adj_results),
-        "composite_cases": len(composite_results),
-        "pypptx_cases": len(pypptx_results),
+        **case_type_counts,
         "errors": errors,
         "results": results,
     }
@@ -292,26 +521,12 @@ async def async_main(args: argparse.Namespace) -> int:
         report["shape_id_range"] = [args.shape_id_min, args.shape_id_max if args.shape_id_max is not None else 500]
     if used_smartart_dir:
         report["smartart_cases_dir"] = used_smartart_dir
-    out_path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    _write_report(out_path, report)
     print(f"Wrote {len(results)} results to {out_path}")
+    # The full report supersedes the per-case progress log.
+    progress_path.unlink(missing_ok=True)
 
     if args.csv:
-        csv_path = out_path.with_suffix(".csv")
-        with open(csv_path, "w", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            w.writerow(["case", "ssim", "color_hist_corr", "fg_iou_tolerant", "chamfer_score", "fg_iou", "passed", "needs_review"])
-            for r in results:
-                s = r["summary"]
-                w.writerow([
-                    r["case"],
-                    round(s["ssim"], 4),
-                    round(s.get("color_hist_corr", 0), 4),
-                    round(s.get("fg_iou_tolerant", 0), 4),
-                    round(s.get("chamfer_score", 0), 4),
-                    round(s["fg_iou"], 4),
-                    r["passed"],
-                    r.get("needs_review", False),
-                ])
         print(f"Wrote CSV to {csv_path}")
 
     if errors:
@@ -345,6 +560,11 @@ def main() -> int:
         metavar="N",
         help="With --shape-id-min, iterate up to this id (inclusive). Default 500.",
     )
+    parser.add_argument(
+        "--probe-missing",
+        action="store_true",
+        help="With --shape-id-min, also evaluate IDs that have no case JSON (reported as not found).",
+    )
     parser.add_argument(
         "--smartart-cases-dir",
         type=str,
@@ -381,6 +601,41 @@ def main() -> int:
         metavar="N",
         help=f"Max parallel requests (default: {DEFAULT_CONCURRENCY})",
     )
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=None,
+        metavar="N",
+        help="HTTP connection pool size (default: --concurrency)",
+    )
+    parser.add_argument(
+        "--max-keepalive",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Idle connections kept alive between cases (default: --max-connections)",
+    )
+    parser.add_argument(
+        "--connect-timeout",
+        type=float,
+        default=DEFAULT_CONNECT_TIMEOUT,
+        metavar="SECONDS",
+        help=f"Timeout for connecting to the API server (default: {DEFAULT_CONNECT_TIMEOUT})",
+    )
+    parser.add_argument(
+        "--read-timeout",
+        type=float,
+        default=DEFAULT_READ_TIMEOUT,
+        metavar="SECONDS",
+        help=f"Timeout for reading/writing one evaluate response (default: {DEFAULT_READ_TIMEOUT})",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=DEFAULT_MAX_RETRIES,
+        metavar="N",
+        help=f"Retries per case on connection errors and 502/504 (default: {DEFAULT_MAX_RETRIES})",
+    )
     parser.add_argument(
         "--csv",
         action="store_true",
@@ -394,7 +649,9 @@ def main() -> int:
         help="Do not write CSV",
     )
     args = parser.parse_args()
-    return asyncio.run(async_main(args))
+    # uvloop.run() only exists from uvloop 0.18; older installs use plain asyncio.
+    run = getattr(uvloop, "run", None) or asyncio.run
+    return run(async_main(args))
 
 
 if __name__ == "__main__":
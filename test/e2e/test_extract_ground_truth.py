@@ -0,0 +1,91 @@
+import pickle
+from pathlib import Path
+
+import pytest
+from pptx import Presentation
+from pptx.util import Inches
+
+import extract_ground_truth as egt
+
+
+def _write_deck(path: Path, slide_count: int) -> Path:
+    prs = Presentation()
+    for i in range(slide_count):
+        slide = prs.slides.add_slide(prs.slide_layouts[5])
+        slide.shapes.title.text = f"Slide {i + 1}"
+        box = slide.shapes.add_textbox(Inches(1), Inches(2), Inches(3), Inches(1))
+        box.text_frame.text = f"Body {i + 1}"
+    prs.save(str(path))
+    return path
+
+
+@pytest.fixture
+def gt_cache_dir(tmp_path: Path, monkeypatch) -> Path:
+    cache_dir = tmp_path / ".gt_cache"
+    monkeypatch.setattr(egt, "GT_CACHE_DIR", cache_dir)
+    monkeypatch.setattr(egt, "GT_CACHE_REFRESH", False)
+    return cache_dir
+
+
+def test_extract_ground_truth_reuses_disk_cache(tmp_path: Path, gt_cache_dir: Path):
+    deck = _write_deck(tmp_path / "source.pptx", 2)
+
+    first = egt.extract_ground_truth(deck)
+    entries = list(gt_cache_dir.glob("*.pkl"))
+    assert len(entries) == 1
+
+    # Poison the entry: a cache hit must return the stored object verbatim
+    first.width = -1
+    entries[0].write_bytes(pickle.dumps(first))
+    assert egt.extract_ground_truth(deck).width == -1
+
+
+def test_extract_ground_truth_refresh_bypasses_cache(
+    tmp_path: Path, gt_cache_dir: Path, monkeypatch
+):
+    deck = _write_deck(tmp_path / "source.pptx", 1)
+    egt.extract_ground_truth(deck)
+    entry = next(gt_cache_dir.glob("*.pkl"))
+    entry.write_bytes(b"not a pickle")
+
+    monkeypatch.setattr(egt, "GT_CACHE_REFRESH", True)
+    result = egt.extract_ground_truth(deck)
+
+    assert result.slide_count == 1
+    assert entry.read_bytes() != b"not a pickle"
+
+
+def test_extract_ground_truth_keeps_nested_group_order(tmp_path: Path, gt_cache_dir: Path):
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    outer = slide.shapes.add_group_shape()
+    inner = outer.shapes.add_group_shape()
+    inner.shapes.add_textbox(Inches(1), Inches(1), Inches(1), Inches(1)).text_frame.text = "deep"
+    outer.shapes.add_textbox(Inches(3), Inches(1), Inches(1), Inches(1)).text_frame.text = "shallow"
+    slide.shapes.add_textbox(Inches(5), Inches(1), Inches(1), Inches(1)).text_frame.text = "top"
+    deck = tmp_path / "source.pptx"
+    prs.save(str(deck))
+
+    nodes = egt.extract_ground_truth(deck).slides[0].nodes
+
+    assert [n.node_type for n in nodes] == ["group", "shape"]
+    assert nodes[1].text_body.total_text == "top"
+    outer_children = nodes[0].children
+    assert [n.node_type for n in outer_children] == ["group", "shape"]
+    assert outer_children[1].text_body.total_text == "shallow"
+    assert outer_children[0].children[0].text_body.total_text == "deep"
+
+
+def test_large_decks_share_one_parse_pool(tmp_path: Path, gt_cache_dir: Path, monkeypatch):
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    first = egt.extract_ground_truth(_write_deck(tmp_path / "a.pptx", egt.PARALLEL_SLIDE_THRESHOLD))
+    pool = egt._parse_pool
+    assert pool is not None
+    egt.extract_ground_truth(_write_deck(tmp_path / "b.pptx", egt.PARALLEL_SLIDE_THRESHOLD + 1))
+    assert egt._parse_pool is pool
+
+    # Under xdist the same deck is parsed inline, with the same result.
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw0")
+    monkeypatch.setattr(egt, "GT_CACHE_REFRESH", True)
+    inline = egt.extract_ground_truth(tmp_path / "a.pptx")
+    assert [s.nodes for s in inline.slides] == [s.nodes for s in first.slides]
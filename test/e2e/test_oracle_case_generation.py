@@ -1,8 +1,11 @@
+import errno
 import json
+import os
 import subprocess
 from pathlib import Path
 
-from oracle.generate_cases import generate_all_cases, generate_all_cases_resilient
+from oracle.case_compiler import compile_case_to_spec
+from oracle.generate_cases import _robust_move, generate_all_cases, generate_all_cases_resilient
 
 
 def test_generate_all_cases_creates_named_pairs(tmp_path: Path):
@@ -50,6 +53,10 @@ def test_generate_all_cases_creates_named_pairs(tmp_path: Path):
         assert pptx_path.exists()
         assert pptx_path.name == "source.pptx"
         assert (pptx_path.parent / "ground-truth.pdf").exists()
+    # Sinks are moved, not copied, into the case dirs.
+    runtime_dir = tmp_path / "testdata" / "oracle-runtime"
+    assert not (runtime_dir / "_macro-output.pptx").exists()
+    assert not (runtime_dir / "_macro-output.pdf").exists()
 
 
 def test_generate_all_cases_resilient_collects_failures(tmp_path: Path):
@@ -92,6 +99,84 @@ def test_generate_all_cases_resilient_collects_failures(tmp_path: Path):
     assert "layout not available" in failures[0]["error"]
 
 
+def test_generate_all_cases_with_workers_uses_per_worker_sinks(tmp_path: Path):
+    cases_dir = tmp_path / "cases"
+    cases_dir.mkdir()
+    names = [f"case-{i}" for i in range(6)]
+    for name in names:
+        shape = "OVAL" if name == "case-3" else "RECTANGLE"
+        case = {
+            "name": name,
+            "slides": [{"nodes": [{"kind": "shape", "shape": shape, "left": 10, "top": 10, "width": 100, "height": 60}]}],
+        }
+        (cases_dir / f"{name}.json").write_text(json.dumps(case), encoding="utf-8")
+
+    sink_dirs = set()
+
+    def fake_run_macro(*, macro_host_pptm, macro_name, output_pdf, macro_params, export_after_macro):
+        spec_path = Path(macro_params[0])
+        sink_dirs.add(spec_path.parent.name)
+        assert Path(output_pdf).parent == spec_path.parent
+        spec = spec_path.read_text(encoding="utf-8")
+        if "SHAPE|OVAL|" in spec:
+            raise RuntimeError("layout not available")
+        out_pptx_line = next(line for line in spec.splitlines() if line.startswith("OUT_PPTX|"))
+        out_pptx = Path(out_pptx_line.split("|", 1)[1])
+        out_pptx.write_bytes(b"pptx")
+        Path(output_pdf).write_bytes(b"%PDF-1.4\n")
+
+    macro_host = tmp_path / "host.pptm"
+    macro_host.write_bytes(b"pptm")
+
+    generated, failures = generate_all_cases_resilient(
+        macro_host=macro_host,
+        cases_dir=cases_dir,
+        testdata_dir=tmp_path / "testdata",
+        run_macro_fn=fake_run_macro,
+        workers=3,
+    )
+
+    assert [p.parent.name for p in generated] == [n for n in names if n != "case-3"]
+    assert sink_dirs <= {"w0", "w1", "w2"}
+    assert [f["case"] for f in failures] == ["case-3"]
+    assert Path(failures[0]["spec_path"]).parent.name in sink_dirs
+
+
+def test_generate_all_cases_moves_slide_pngs_into_case_dir(tmp_path: Path):
+    cases_dir = tmp_path / "cases"
+    cases_dir.mkdir()
+    case = {
+        "name": "case-a",
+        "slides": [{"nodes": [{"kind": "shape", "shape": "RECTANGLE", "left": 10, "top": 10, "width": 100, "height": 60}]}],
+    }
+    (cases_dir / "case-a.json").write_text(json.dumps(case), encoding="utf-8")
+
+    def fake_run_macro(*, macro_host_pptm, macro_name, output_pdf, macro_params, export_after_macro):
+        spec = Path(macro_params[0]).read_text(encoding="utf-8")
+        out_pptx_line = next(line for line in spec.splitlines() if line.startswith("OUT_PPTX|"))
+        png_prefix = next(line for line in spec.splitlines() if line.startswith("OUT_PNG|")).split("|")[1]
+        Path(out_pptx_line.split("|", 1)[1]).write_bytes(b"pptx")
+        Path(output_pdf).write_bytes(b"%PDF-1.4\n")
+        for n in (1, 2, 10):
+            Path(f"{png_prefix}_slide{n}.png").write_bytes(f"png{n}".encode())
+
+    macro_host = tmp_path / "host.pptm"
+    macro_host.write_bytes(b"pptm")
+
+    (pptx_path,) = generate_all_cases(
+        macro_host=macro_host,
+        cases_dir=cases_dir,
+        testdata_dir=tmp_path / "testdata",
+        run_macro_fn=fake_run_macro,
+        export_png=True,
+    )
+
+    slides_d = pptx_path.parent / "slides"
+    assert sorted(p.name for p in slides_d.iterdir()) == ["slide1.png", "slide10.png", "slide2.png"]
+    assert (slides_d / "slide10.png").read_bytes() == b"png10"
+    assert not list((tmp_path / "testdata" / "oracle-runtime").glob("*.png"))
+
+
 def test_generate_all_cases_reuses_existing_pairs_when_cached(tmp_path: Path):
     cases_dir = tmp_path / "cases"
     cases_dir.mkdir()
@@ -206,3 +291,156 @@ def test_generate_all_cases_resilient_includes_stderr_for_called_process_error(t
     assert len(failures) == 1
     assert failures[0]["case"] == "case-a"
     assert "-1743" in failures[0]["error"]
+
+
+def test_compile_case_to_spec_emits_one_line_per_node_kind(tmp_path: Path):
+    case = {
+        "name": "case-a",
+        "slides": [
+            {
+                "nodes": [
+                    {"kind": "shape", "shape": "RECTANGLE", "left": 10.0, "top": 10.5, "width": 100, "height": 60},
+                    {"kind": "smartart", "layout": "urn:layout", "left": 1, "top": 2, "width": 3, "height": 4},
+                    {"kind": "chart", "chartTypeId": 51, "left": 1, "top": 2, "width": 3, "height": 4},
+                    {"kind": "table", "rows": 2, "cols": 3, "left": 1, "top": 2, "width": 3, "height": 4},
+                    {"kind": "connector", "connectorType": 1, "beginX": 1, "beginY": 2.25, "endX": 3, "endY": 4},
+                    {"kind": "fillstroke", "fillKind": "solid", "strokeKind": "dash", "left": 1, "top": 2, "width": 3, "height": 4},
+                    {"kind": "textbox", "text": "a|b", "left": 1, "top": 2, "width": 3, "height": 4},
+                ]
+            }
+        ],
+    }
+    case_path = tmp_path / "case-a.json"
+    case_path.write_text(json.dumps(case), encoding="utf-8")
+
+    spec_path = compile_case_to_spec(
+        case_path,
+        tmp_path / "case-a.spec.txt",
+        tmp_path / "out.pptx",
+        tmp_path / "out.pdf",
+    )
+
+    lines = spec_path.read_bytes().decode("utf-8").splitlines()
+    assert lines[2:] == [
+        "SLIDE",
+        "SHAPE|RECTANGLE|10|10.5|100|60",
+        "SMARTART|urn:layout|1|2|3|4",
+        "CHART|51|1|2|3|4",
+        "TABLE|2|3|1|2|3|4",
+        "CONNECTOR|1|1|2.25|3|4",
+        "FILLSTROKE|solid|dash|1|2|3|4",
+        "TEXTBOX|a/b|1|2|3|4",
+    ]
+
+
+def test_robust_move_falls_back_to_copy_across_devices(tmp_path: Path, monkeypatch):
+    src = tmp_path / "sink.pdf"
+    dst = tmp_path / "case" / "ground-truth.pdf"
+    dst.parent.mkdir()
+    src.write_bytes(b"%PDF-1.4\n")
+
+    def cross_device_replace(a, b):
+        raise OSError(errno.EXDEV, os.strerror(errno.EXDEV))
+
+    monkeypatch.setattr(os, "replace", cross_device_replace)
+    _robust_move(src, dst)
+
+    assert dst.read_bytes() == b"%PDF-1.4\n"
+    assert not src.exists()
+
+
+
+def _patch_windows_batch_session(monkeypatch, sessions: list, fail: bool = False):
+    from contextlib import contextmanager
+
+    from oracle import generate_cases
+
+    class FakeSession:
+        def __init__(self):
+            self.runs = 0
+
+        def run_export(self, *, macro_host_pptm, macro_name, output_pdf, macro_params=None, export_after_macro=True):
+            self.runs += 1
+            spec = Path(macro_params[0]).read_text(encoding="utf-8")
+            out_pptx = Path(next(line for line in spec.splitlines() if line.startswith("OUT_PPTX|")).split("|", 1)[1])
+            out_pptx.write_bytes(b"pptx")
+            Path(output_pdf).write_bytes(b"%PDF-1.4\n")
+
+    @contextmanager
+    def fake_batch_session():
+        if fail:
+            raise OSError("PowerPoint.Application could not be created")
+        session = FakeSession()
+        sessions.append(session)
+        yield session
+
+    monkeypatch.setattr(generate_cases.sys, "platform", "win32")
+    monkeypatch.setattr(generate_cases, "powerpoint_batch_session_win", fake_batch_session)
+    return generate_cases
+
+
+def _write_rect_cases(cases_dir: Path, names: tuple[str, ...]) -> None:
+    cases_dir.mkdir()
+    for name in names:
+        case = {"slides": [{"nodes": [{"kind": "shape", "shape": "RECTANGLE", "left": 10, "top": 10, "width": 100, "height": 60}]}]}
+        (cases_dir / f"{name}.json").write_text(json.dumps(case), encoding="utf-8")
+
+
+def test_generate_all_cases_reuses_one_com_session_on_windows(tmp_path: Path, monkeypatch):
+    sessions: list = []
+    generate_cases = _patch_windows_batch_session(monkeypatch, sessions)
+    _write_rect_cases(tmp_path / "cases", ("case-a", "case-b", "case-c"))
+    macro_host = tmp_path / "host.pptm"
+    macro_host.write_bytes(b"pptm")
+
+    out = generate_cases.generate_all_cases(
+        macro_host=macro_host,
+        cases_dir=tmp_path / "cases",
+        testdata_dir=tmp_path / "testdata",
+    )
+
+    assert len(out) == 3
+    assert len(sessions) == 1
+    assert sessions[0].runs == 3
+
+
+def test_generate_all_cases_cached_batch_never_starts_powerpoint_on_windows(tmp_path: Path, monkeypatch):
+    sessions: list = []
+    generate_cases = _patch_windows_batch_session(monkeypatch, sessions, fail=True)
+    _write_rect_cases(tmp_path / "cases", ("case-a", "case-b"))
+    testdata_dir = tmp_path / "testdata"
+    for name in ("case-a", "case-b"):
+        case_d = testdata_dir / "cases" / name
+        case_d.mkdir(parents=True)
+        (case_d / "source.pptx").write_bytes(b"cached-pptx")
+        (case_d / "ground-truth.pdf").write_bytes(b"cached-pdf")
+    macro_host = tmp_path / "host.pptm"
+    macro_host.write_bytes(b"pptm")
+
+    out = generate_cases.generate_all_cases(
+        macro_host=macro_host,
+        cases_dir=tmp_path / "cases",
+        testdata_dir=testdata_dir,
+        reuse_existing=True,
+    )
+
+    assert [p.parent.name for p in out] == ["case-a", "case-b"]
+    assert sessions == []
+
+
+def test_generate_all_cases_resilient_records_windows_launch_failure_per_case(tmp_path: Path, monkeypatch):
+    sessions: list = []
+    generate_cases = _patch_windows_batch_session(monkeypatch, sessions, fail=True)
+    _write_rect_cases(tmp_path / "cases", ("case-a", "case-b"))
+    macro_host = tmp_path / "host.pptm"
+    macro_host.write_bytes(b"pptm")
+
+    generated, failures = generate_cases.generate_all_cases_resilient(
+        macro_host=macro_host,
+        cases_dir=tmp_path / "cases",
+        testdata_dir=tmp_path / "testdata",
+    )
+
+    assert generated == []
+    assert [f["case"] for f in failures] == ["case-a", "case-b"]
+    assert all("could not be created" in f["error"] for f in failures)
@@ -37,3 +37,59 @@ def test_quality_gate_uses_structural_text_and_visual_signals():
     )
     assert failed["passed"] is False
     assert any("text_coverage" in reason for reason in failed["reasons"])
+
+
+def test_visual_metrics_are_cached_per_image_pair(tmp_path, monkeypatch):
+    from oracle import metrics
+
+    monkeypatch.setattr(metrics, "METRIC_CACHE_ENABLED", True)
+    monkeypatch.setattr(metrics, "METRIC_CACHE_DIR", tmp_path)
+    calls = []
+    real_win_size = metrics._ssim_win_size
+    monkeypatch.setattr(metrics, "_ssim_win_size", lambda a: calls.append(1) or real_win_size(a))
+
+    a = np.zeros((60, 80, 3), dtype=np.uint8)
+    b = a.copy()
+    b[10:30, 10:30] = 255
+
+    first = metrics.compute_visual_metrics(a, b)
+    assert metrics.compute_visual_metrics(a, b) == first
+    assert len(calls) == 1
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+    metrics.compute_visual_metrics(a, b, force=True)
+    assert len(calls) == 2
+
+    # Same bytes, different layout must not collide.
+    metrics.compute_visual_metrics(a.reshape(80, 60, 3), b.reshape(80, 60, 3))
+    assert len(calls) == 3
+
+
+def test_visual_metrics_cache_is_off_by_default(tmp_path, monkeypatch):
+    from oracle import metrics
+
+    monkeypatch.setattr(metrics, "METRIC_CACHE_DIR", tmp_path / "cache")
+    a = np.zeros((60, 80, 3), dtype=np.uint8)
+    metrics.compute_visual_metrics(a, a)
+    assert not (tmp_path / "cache").exists()
+
+
+def test_ssim_subsampling_only_touches_ssim(tmp_path, monkeypatch):
+    from oracle import metrics
+
+    monkeypatch.setattr(metrics, "METRIC_CACHE_ENABLED", True)
+    monkeypatch.setattr(metrics, "METRIC_CACHE_DIR", tmp_path)
+    a = np.full((200, 300, 3), 255, dtype=np.uint8)
+    b = a.copy()
+    a[40:160, 60:200] = (30, 90, 200)
+    b[44:164, 64:204] = (30, 90, 200)
+
+    full = metrics.compute_visual_metrics(a, b)
+    monkeypatch.setattr(metrics, "SSIM_MAX_SIDE", 256)
+    half = metrics.compute_visual_metrics(a, b)
+
+    assert len(list(tmp_path.glob("*.json"))) == 2
+    assert half["ssim"] != full["ssim"]
+    assert abs(half["ssim"] - full["ssim"]) < 0.05
+    for key in ("edge_iou", "mae", "color_hist_corr"):
+        assert half[key] == full[key]
@@ -59,3 +59,68 @@ def test_merge_case_results_into_catalog_updates_statuses():
     assert catalog["cases"]["case-b"]["status"] == "unsupported"
     assert catalog["cases"]["case-c"]["status"] == "supported"
     assert catalog["cases"]["case-d"]["status"] == "unsupported"
+
+
+def test_merge_case_results_into_catalog_copies_reasons():
+    catalog = {"cases": {}}
+    row = {"case": "case-a", "passed": False, "reasons": ["metric:ssim"]}
+
+    merge_case_results_into_catalog(catalog, [row])
+    row["reasons"].append("later")
+
+    assert catalog["cases"]["case-a"]["last_reasons"] == ["metric:ssim"]
+
+
+def test_load_or_init_support_catalog_normalizes_stale_entries(tmp_path: Path):
+    cases_dir = tmp_path / "cases"
+    cases_dir.mkdir()
+
+    catalog_path = tmp_path / "support-catalog.json"
+    catalog_path.write_text(
+        json.dumps({"cases": {"gone-a": {"status": " Supported "}, "gone-b": {"status": "bogus"}}}),
+        encoding="utf-8",
+    )
+
+    catalog = load_or_init_support_catalog(catalog_path=catalog_path, cases_dir=cases_dir)
+
+    assert catalog["cases"]["gone-a"]["status"] == "supported"
+    assert select_case_names_by_scope(catalog, scope="unknown") == {"gone-b"}
+
+
+def test_save_support_catalog_output_does_not_depend_on_orjson(tmp_path: Path, monkeypatch):
+    from oracle import support_catalog
+
+    catalog = {
+        "version": 1,
+        "cases": {
+            "形状-a": {
+                "status": "supported",
+                "last_reasons": ["metric:ssim"],
+                "last_summary": {"ssim": 0.5, "chamfer": 0.00001, "area": 1e20},
+            }
+        },
+    }
+    monkeypatch.setattr(support_catalog, "_utc_now_iso", lambda: "2026-01-01T00:00:00Z")
+
+    support_catalog.save_support_catalog(tmp_path / "a.json", catalog)
+    monkeypatch.setattr(support_catalog, "orjson", None)
+    support_catalog.save_support_catalog(tmp_path / "b.json", catalog)
+
+    # Float spelling may differ between the writers; the documents may not.
+    assert json.loads((tmp_path / "a.json").read_bytes()) == catalog
+    assert json.loads((tmp_path / "b.json").read_bytes()) == catalog
+
+
+def test_load_support_catalog_accepts_nan_written_without_orjson(tmp_path: Path):
+    cases_dir = tmp_path / "cases"
+    cases_dir.mkdir()
+    catalog_path = tmp_path / "support-catalog.json"
+    catalog_path.write_text(
+        json.dumps({"cases": {"case-a": {"status": "unsupported", "ssim": float("nan")}}}),
+        encoding="utf-8",
+    )
+
+    catalog = load_or_init_support_catalog(catalog_path=catalog_path, cases_dir=cases_dir)
+
+    assert catalog["cases"]["case-a"]["status"] == "unsupported"
+    assert catalog["cases"]["case-a"]["ssim"] != catalog["cases"]["case-a"]["ssim"]
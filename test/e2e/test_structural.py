@@ -56,7 +56,7 @@ def _dict_to_node(n: dict) -> NodeData:
             TextParagraph(level=p.get("level", 0), text=p.get("text", ""))
             for p in tb.get("paragraphs", [])
         ]
-        text_body = TextBody(paragraphs=paragraphs, total_text=tb.get("totalText", ""))
+        text_body = TextBody(paragraphs=paragraphs)
 
     rows = None
     if r_list := n.get("rows"):